@@ -6,18 +6,74 @@ sets up environment variables, and provides the main entry point
 for running the service.
 """
 
+import argparse
+import os
+from contextlib import asynccontextmanager
+
 from dotenv import load_dotenv
 
 # Load environment variables from .env file at startup
 load_dotenv()
 
+import orjson
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from src.routes import agent, document, website, wiki
-from src.services.sql.sql import sql_agent
+from src.utils.agent_dependency import get_agent
+from src.utils.dependency import (
+    close_database,
+    close_http_client,
+    close_llm_http_client,
+    get_database,
+    get_http_client,
+    get_indexer,
+    get_process_pool,
+    shutdown_process_pool,
+)
+from src.utils.fastapi_compat import install_dependency_inspection_cache
 from src.utils.logger import logger
+from src.utils.middleware import (
+    RequestEnvelopeMiddleware,
+    StreamingAwareGZipMiddleware,
+)
+
+# Health check payload never changes, so it is serialized once at import
+HEALTH_RESPONSE = Response(
+    content=orjson.dumps({"status": "Healthy", "version": "0.1"}),
+    media_type="application/json",
+)
+
+
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    """
+    Build the shared service singletons once per worker at startup.
+
+    The indexer (embedding model + vector store), the database and the agent
+    (LLM client + compiled graph) are expensive to construct, so they are
+    created before the first request is accepted instead of lazily on it.
+    The outbound HTTP clients, the database connection pool and the process
+    pool for CPU-bound parsing are closed when the app stops.
+
+    Args:
+        application (FastAPI): The application being started
+    """
+    logger.info("Initializing shared services...")
+    # Warm the singletons the route dependencies hand out
+    get_indexer()
+    get_database()
+    get_agent()
+    get_process_pool()
+    get_http_client()
+    logger.info("Shared services initialized.")
+    yield
+    await close_http_client()
+    await close_llm_http_client()
+    await close_database()
+    shutdown_process_pool()
 
 
 def create_app() -> FastAPI:
@@ -30,6 +86,8 @@ def create_app() -> FastAPI:
     Returns:
         FastAPI: Configured FastAPI application instance
     """
+    install_dependency_inspection_cache()
+
     application = FastAPI(
         title="AmBlue",
         version="0.1",
@@ -37,8 +95,14 @@ def create_app() -> FastAPI:
         # Additional FastAPI configurations can be added here
         docs_url="/docs",  # Swagger UI endpoint
         redoc_url="/redoc",  # ReDoc endpoint
+        lifespan=lifespan,  # Startup/shutdown of shared services
+        default_response_class=ORJSONResponse,  # orjson based serialization
     )
 
+    # Logs one line per request and turns unhandled errors into JSON 500s,
+    # added first so error responses still get CORS headers
+    application.add_middleware(RequestEnvelopeMiddleware)
+
     application.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -47,50 +111,86 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Compress large JSON payloads, the agent SSE stream must stay unbuffered
+    application.add_middleware(
+        StreamingAwareGZipMiddleware,
+        minimum_size=1000,
+        compresslevel=5,
+        excluded_paths=(agent.router.prefix,),
+    )
+
     @application.get(
         path="/check-health",
         tags=["Health"],
         summary="Health Check Endpoint",
         description="Returns the current status and version of the service",
     )
-    async def check_health() -> dict:
+    async def check_health() -> Response:
         """
         Health check endpoint to verify service status.
 
+        Returns the pre-serialized response, so load balancer pings skip
+        serialization entirely. The handler stays async to avoid the
+        threadpool hop FastAPI uses for sync endpoints.
+
         Returns:
-            dict: Dictionary containing service status and version information
+            Response: JSON response containing service status and version information
         """
-        return {
-            "status": "Healthy",
-            "version": "0.1",
-        }
+        return HEALTH_RESPONSE
 
     application.include_router(website.router)
     application.include_router(wiki.router)
     application.include_router(document.router)
     application.include_router(agent.router)
 
-    # sql_agent()
-
     return application
 
 
-# Create the FastAPI application instance
-app = create_app()
-
 # Main entry point for running the application
-if __name__ == "__main__":
+if __name__ != "__main__":
+    # Create the FastAPI application instance. Only uvicorn's workers import
+    # this module by name, the process running ``python -m src`` merely
+    # supervises them and never serves a request, so it skips building the
+    # app (and its route table) that each worker builds anyway.
+    app = create_app()
+else:
     """
-    Development server configuration.
+    Server configuration.
 
-    Run the application using uvicorn server with hot reload enabled
-    for development purposes.
+    Run the application using uvicorn with the uvloop event loop (where it
+    is installed) and the httptools HTTP parser. Hot reload is only available with a single
+    worker, so production runs fan out across CPU cores instead.
     """
 
+    parser = argparse.ArgumentParser(description="Run the AmBlue API service")
+    parser.add_argument("--host", default="0.0.0.0", help="Bind host")
+    parser.add_argument("--port", type=int, default=8000, help="Bind port")
+    parser.add_argument(
+        "--reload", action="store_true", help="Enable auto-reload for development"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (defaults to the CPU count, ignored with --reload)",
+    )
+    args = parser.parse_args()
+
+    workers = 1 if args.reload else (args.workers or max(2, os.cpu_count() or 1))
+    # Read by the workers to size their process pools
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+
     uvicorn.run(
-        app=app,
-        host="0.0.0.0",
-        port=8000,  # Default port for the service
-        reload=True,  # Enable auto-reload for development
-        log_level="info",  # Set logging level
+        # Import string is required for reload and multiple workers
+        "src.__main__:app",
+        host=args.host,
+        port=args.port,  # Default port for the service
+        reload=args.reload,
+        workers=workers,
+        loop="auto",  # uvloop where installed, asyncio on Windows
+        http="httptools",  # C based HTTP parser
+        limit_concurrency=1000,
+        timeout_keep_alive=30,
+        log_level="warning" if workers > 1 else "info",
+        access_log=False,  # Requests are logged by RequestEnvelopeMiddleware
     )
@@ -5,9 +5,13 @@ This module defines the API routes for agent operations,
 handling question answering through server-sent events (SSE).
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import re
+from typing import AsyncGenerator, Optional
+
+from fastapi import APIRouter, Depends, Request, status
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, Field, ValidationError
+from pydantic import BaseModel, ConfigDict, Field
 
 from src.services.agent_service import AgentService
 from src.utils.agent_dependency import get_agent
@@ -23,18 +27,23 @@ class AgentProcessingRequest(BaseModel):
         user_id (str): The ID of the user making the request
     """
 
-    question: str = Field(..., description="The question to be answered by the agent")
-    user_id: str = Field(..., description="The ID of the user making the request")
-
-    class Config:
-        """Pydantic model configuration"""
-
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "question": "What is the capital of France?",
                 "user_id": "user123",
             }
-        }
+        },
+        extra="forbid",
+        str_strip_whitespace=True,
+    )
+
+    question: str = Field(
+        ...,
+        min_length=1,
+        description="The question to be answered by the agent",
+    )
+    user_id: str = Field(..., description="The ID of the user making the request")
 
 
 # Create router with prefix and tags for API documentation
@@ -48,87 +57,129 @@ router = APIRouter(
 )
 
 
-async def format_sse(data: str) -> str:
+# Headers that stop proxies (e.g. nginx) from buffering the event stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+# Seconds without a token after which a keep-alive comment is sent
+HEARTBEAT_INTERVAL = 15
+HEARTBEAT = b": heartbeat\n\n"
+
+# Line terminators of the event stream format
+SSE_LINE_BREAK = re.compile(rb"\r\n|\r|\n")
+
+
+def sse_event(chunk: bytes) -> bytes:
     """
-    Format data as Server-Sent Events (SSE) message.
+    Frame a chunk of the answer as a Server-Sent Event.
+
+    Every line of the chunk goes on its own data field, clients join the
+    fields of an event with a newline, so line breaks inside the answer
+    survive the framing.
 
     Args:
-        data (str): The data to be formatted
+        chunk (bytes): UTF-8 text of the answer
 
     Returns:
-        str: Formatted SSE message
+        bytes: The chunk as one event
     """
-    return f"data: {data}\n\n"
+    return (
+        b"".join(b"data: " + line + b"\n" for line in SSE_LINE_BREAK.split(chunk))
+        + b"\n"
+    )
+
+
+async def with_heartbeat(
+    request: Request, stream: AsyncGenerator[bytes, None]
+) -> AsyncGenerator[bytes, None]:
+    """
+    Relay the answer as an event stream, sending heartbeats while it is idle.
+
+    Each chunk of the wrapped stream is sent as one data event. A heartbeat
+    comment, which event stream clients ignore, is sent whenever no chunk
+    arrived for HEARTBEAT_INTERVAL seconds, so proxies do not drop the
+    connection while the agent retrieves documents or waits for the first
+    token. The idle
+    ticks are also used to check whether the client is still connected.
+    When the client goes away, or the response is cancelled, the wrapped
+    stream is cancelled and closed, aborting the upstream LLM call.
+
+    Args:
+        request (Request): The incoming request, used to detect disconnects
+        stream (AsyncGenerator[bytes, None]): The answer text to relay
+
+    Yields:
+        bytes: Events of the answer interleaved with heartbeat comments
+    """
+    pending: Optional[asyncio.Task] = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(anext(stream))
+            done, _ = await asyncio.wait({pending}, timeout=HEARTBEAT_INTERVAL)
+
+            if not done:
+                if await request.is_disconnected():
+                    logger.info("Client disconnected, cancelling agent stream")
+                    break
+                yield HEARTBEAT
+                continue
+
+            chunk_task, pending = pending, None
+            try:
+                chunk = chunk_task.result()
+            except StopAsyncIteration:
+                break
+            yield sse_event(chunk)
+    finally:
+        if pending is not None:
+            pending.cancel()
+            await asyncio.wait({pending})
+        await stream.aclose()
 
 
 @router.post(
     "/",
     response_class=StreamingResponse,
     summary="Generate Agent Response",
-    description="Generates a streaming response for the given question using the agent.",
+    description=(
+        "Generates a streaming response for the given question using the agent. "
+        "The answer is sent as Server-Sent Events, each chunk as one `data:` "
+        "event (a chunk spanning several lines uses one `data:` field per "
+        "line). Comment lines starting with `:` are keep-alive heartbeats "
+        "sent while the agent is idle and carry no content."
+    ),
     responses={
-        status.HTTP_400_BAD_REQUEST: {"description": "Invalid request parameters"},
-        status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Invalid request format"},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Invalid request format or empty question"
+        },
     },
 )
 async def generate_response(
-    request: AgentProcessingRequest, agent_service: AgentService = Depends(get_agent)
+    request: AgentProcessingRequest,
+    http_request: Request,
+    agent_service: AgentService = Depends(get_agent),
 ) -> StreamingResponse:
     """
     Generate streaming response for the given question.
 
     Args:
         request (AgentProcessingRequest): The request containing the question
+        http_request (Request): The raw request, used to detect disconnects
 
     Returns:
         StreamingResponse: Server-sent events stream with agent's response
-
-    Raises:
-        HTTPException: If there's an error processing the request
     """
-    try:
-        # Log the incoming request with more detail
-        logger.info(
-            f"Received request - Question: {request.question}, User ID: {request.user_id}"
-        )
-
-        # Validate input data more thoroughly
-        if not isinstance(request.question, str) or not isinstance(
-            request.user_id, str
-        ):
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail="Invalid data types: question and user_id must be strings",
-            )
-
-        # Validate question
-        if not request.question.strip():
-            logger.error("Empty question in request")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Question cannot be empty.",
-            )
-
-        # Generate streaming response
-        response = StreamingResponse(
+    logger.info(
+        "Agent request - User ID: %s, Question: %s",
+        request.user_id,
+        request.question,
+    )
+
+    return StreamingResponse(
+        with_heartbeat(
+            http_request,
             agent_service.stream_response(request.question, request.user_id),
-            media_type="text/event-stream",
-        )
-
-        # Log successful processing
-        logger.info("Successfully initiated response streaming")
-
-        return response
-
-    except ValidationError as e:
-        logger.error(f"Validation error: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=str(e),
-        )
-    except Exception as e:
-        error_msg = f"Error processing question: {str(e)}"
-        logger.error(error_msg)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=error_msg
-        )
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
@@ -5,23 +5,13 @@ This module defines the API routes for document processing operations,
 with support for concurrent document processing from multiple users.
 """
 
-from typing import Any, Dict
-
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
 
-from src.services.document_service import process_document
-from src.services.indexer_service import IndexerService
-from src.utils.dependency import get_indexer
+from src.services.document_service import DocumentService, process_document
+from src.utils.document_dependency import get_document_service
 from src.utils.logger import logger
 
-
-class DocumentProcessRequest(BaseModel):
-    """Request model for document processing."""
-
-    file: UploadFile
-
-
 router = APIRouter(
     prefix="/document",
     tags=["document"],
@@ -34,7 +24,6 @@ router = APIRouter(
 
 @router.post(
     "/",
-    response_model=Dict[str, Any],
     status_code=status.HTTP_200_OK,
     responses={
         status.HTTP_400_BAD_REQUEST: {"description": "Invalid request parameters"},
@@ -42,45 +31,33 @@ router = APIRouter(
     },
 )
 async def process_document_endpoint(
-    file: UploadFile = File(...), indexer: IndexerService = Depends(get_indexer)
-) -> Dict[str, Any]:
+    file: UploadFile = File(...),
+    document_service: DocumentService = Depends(get_document_service),
+) -> ORJSONResponse:
     """
     Process an uploaded document file synchronously with concurrent user support.
 
     Args:
         file (UploadFile): The uploaded file to process
-        indexer (IndexerService): Service for indexing document content
+        document_service (DocumentService): Service processing the document
 
     Returns:
-        Dict[str, Any]: Processing results including status and metadata
+        ORJSONResponse: Processing results including status and metadata
 
     Raises:
-        HTTPException: If document processing fails
+        HTTPException: If no file was uploaded
     """
-    try:
-        logger.info(f"Processing document: {file.filename}")
-
-        if not file:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="File not found. Please upload the file to process",
-            )
+    logger.info("Document request - File: %s", file.filename)
 
-        # Read file content
-        content = await file.read()
-
-        # Process the document and wait for result
-        result = await process_document(
-            content, file.filename, file.content_type, indexer
-        )
-
-        logger.info(f"Successfully processed document: {file.filename}")
-        return result
-
-    except Exception as e:
-        error_msg = f"Error processing document {file.filename}: {str(e)}"
-        logger.error(error_msg)
+    if not file:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=error_msg,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File not found. Please upload the file to process",
         )
+
+    # Process the document and wait for result, the upload is streamed
+    # to disk by the service instead of being read into memory here
+    result = await process_document(
+        file, file.filename, file.content_type, document_service
+    )
+    return ORJSONResponse(content=result)
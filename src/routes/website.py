@@ -1,24 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, Field, HttpUrl
+import httpx
+from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
 
 from src.services.database_service import DatabaseService
 from src.services.indexer_service import IndexerService
 from src.services.website_service import WebsiteService
-from src.utils.dependency import get_database, get_indexer
+from src.utils.dependency import get_database, get_http_client, get_indexer
 from src.utils.logger import logger
+from src.utils.status import TaskStatusRoutes
 
 
 class WebsiteProcessingRequest(BaseModel):
     """Pydantic model for website processing request."""
 
+    model_config = ConfigDict(
+        json_schema_extra={"example": {"url": "https://example.com"}},
+        extra="forbid",
+        str_strip_whitespace=True,
+    )
+
     url: HttpUrl = Field(..., description="Website URL to process")
     max_concurrent_requests: int = Field(
         default=10, description="Maximum concurrent requests"
     )
 
-    class Config:
-        json_schema_extra = {"example": {"url": "https://example.com"}}
-
 
 class ProcessingStatusResponse(BaseModel):
     """Pydantic model for processing status response."""
@@ -34,69 +40,76 @@ class ProcessingStatusResponse(BaseModel):
 
 
 # Initialize router
-router = APIRouter(prefix="/website", tags=["website"])
+router = APIRouter(
+    prefix="/website", tags=["website"], default_response_class=ORJSONResponse
+)
+
+
+def _canonical_url(url: HttpUrl) -> str:
+    """
+    Build the key a website is stored and looked up under.
+
+    pydantic already lowercases the scheme and host and drops default ports,
+    so only the fragment, which never reaches the server, is removed. The
+    path is kept as is, its trailing slash decides where the sitemap is
+    looked up.
+
+    Args:
+        url (HttpUrl): The validated request URL
+
+    Returns:
+        str: The canonical URL
+    """
+    return str(url).split("#", 1)[0]
 
 
 def get_processor(
     indexer: IndexerService = Depends(get_indexer),
     database: DatabaseService = Depends(get_database),
+    http_client: httpx.AsyncClient = Depends(get_http_client),
 ) -> WebsiteService:
-    return WebsiteService(indexer, database)
+    return WebsiteService(indexer, database, http_client)
 
 
-@router.post("/", response_model=dict)
+@router.post("/")
 async def start_website_processing(
     request: WebsiteProcessingRequest,
     processor: WebsiteService = Depends(get_processor),
-    database: DatabaseService = Depends(get_database),
-) -> dict:
+) -> ORJSONResponse:
     """
     Start website processing and return task ID for status tracking.
     """
-    try:
-        # Check if URL is already being processed
-        existing_task = database.get_task_by_url(str(request.url))
-        if existing_task:
-            logger.info("Website is already processed.")
-            return {
-                "status": existing_task["status"],
-                "task_id": existing_task["task_id"],
-                "message": "Website is already being processed or processed.",
-            }
+    url = _canonical_url(request.url)
 
+    # Check if URL is already being processed
+    existing_task = await processor.database.get_task_by_url(url)
+    if not existing_task:
         # Start new processing task - the processor will create the task record
-        task_id = await processor.process_website(str(request.url))
-        return {
-            "status": "started",
-            "task_id": task_id,
-            "message": "Website processing started",
+        task_id = await processor.process_website(url)
+        if task_id:
+            return ORJSONResponse(
+                content={
+                    "status": "started",
+                    "task_id": task_id,
+                    "message": "Website processing started",
+                }
+            )
+
+        # Another request registered the URL in the meantime
+        existing_task = await processor.database.get_task_by_url(url)
+
+    logger.info("Website is already processed.")
+    return ORJSONResponse(
+        content={
+            "status": existing_task["status"],
+            "task_id": existing_task["task_id"],
+            "message": "Website is already being processed or processed.",
         }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
-        )
+    )
 
 
-@router.get("/status/{task_id}", response_model=ProcessingStatusResponse)
-async def get_processing_status(
-    task_id: str, database: DatabaseService = Depends(get_database)
-) -> ProcessingStatusResponse:
-    """
-    Get detailed processing status for frontend tracking.
-    """
-    task = database.get_task(task_id)
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
-        )
-
-    return ProcessingStatusResponse(
-        status=task["status"]["status"].value,
-        total_urls=task["status"]["total_urls"],
-        processed_urls=task["status"]["processed_urls"],
-        remaining_urls=task["status"]["remaining_urls"],
-        failed_urls=task["status"]["failed_urls"],
-        current_url=task["status"]["current_url"],
-        percent_complete=task["status"]["percent_complete"],
-        error=task["status"]["error"],
-    )
+# Batch and single task status endpoints, shared with the wiki router
+status_routes = TaskStatusRoutes(
+    ProcessingStatusResponse, DatabaseService.get_task, DatabaseService.get_tasks
+)
+status_routes.register(router)
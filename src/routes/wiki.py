@@ -2,19 +2,25 @@
 Wiki Routes Module with concurrent request handling
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional
+
+import httpx
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
 
 from src.services.database_service import DatabaseService
 from src.services.indexer_service import IndexerService
-from src.services.wiki_service import WikiService
-from src.utils.dependency import get_database, get_indexer
-from src.utils.logger import logger
+from src.services.wiki_service import WikiService, wiki_task_id
+from src.utils.dependency import get_database, get_http_client, get_indexer
+from src.utils.status import TaskStatusRoutes
 
 
 class WikiProcessingRequest(BaseModel):
     """Pydantic model for wiki processing request."""
 
+    model_config = ConfigDict(extra="forbid", str_strip_whitespace=True)
+
     organization: str = Field(default="cloudcadi", description="Organization name")
     project: str = Field(default="CloudCADI", description="Project name")
     wikiIdentifier: str = Field(default="CloudCADI.wiki", description="Wiki Identifier")
@@ -39,6 +45,7 @@ class ProcessingStatusResponse(BaseModel):
 router = APIRouter(
     prefix="/wiki",
     tags=["wiki"],
+    default_response_class=ORJSONResponse,
     responses={
         status.HTTP_404_NOT_FOUND: {"description": "Not found"},
         status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Internal server error"},
@@ -49,74 +56,75 @@ router = APIRouter(
 def get_processor(
     indexer: IndexerService = Depends(get_indexer),
     database: DatabaseService = Depends(get_database),
+    http_client: httpx.AsyncClient = Depends(get_http_client),
 ) -> WikiService:
-    return WikiService(indexer, database)
+    return WikiService(indexer, database, http_client)
+
+
+async def _get_existing_task(
+    database: DatabaseService, task_id: str, request: WikiProcessingRequest
+) -> Optional[Dict[str, Any]]:
+    """
+    Look up the task of a wiki by its primary key.
+
+    Tasks created before task IDs were hashed are only found by the wiki
+    details, which are checked when the key lookup misses.
+
+    Returns:
+        Optional[Dict[str, Any]]: The task ID and status, if the wiki has a task
+    """
+    if task := await database.get_wiki_task(task_id):
+        return {"task_id": task_id, "status": task["status"]["status"].value}
+
+    return await database.get_wiki_task_by_details(
+        request.organization, request.project, request.wikiIdentifier
+    )
 
 
-@router.post("/", response_model=dict)
+@router.post("/")
 async def start_wiki_processing(
     request: WikiProcessingRequest,
     processor: WikiService = Depends(get_processor),
-    database: DatabaseService = Depends(get_database),
-) -> dict:
+) -> ORJSONResponse:
     """
     Start wiki processing and return task ID for status tracking.
     """
-    try:
-        task_id = (
-            f"{request.organization.lower()}_{request.project}_{request.wikiIdentifier}"
-        )
-        existing_task = database.get_wiki_task_by_details(
-            request.organization, request.project, request.wikiIdentifier
-        )
-
-        if existing_task:
-            return {
-                "status": existing_task["status"],
-                "task_id": existing_task["task_id"],
-                "message": "Wiki is already being processed or processed",
-            }
-
-        task_id = await processor.process_wiki(
+    task_id = wiki_task_id(
+        request.organization, request.project, request.wikiIdentifier
+    )
+    existing_task = await _get_existing_task(processor.database, task_id, request)
+
+    if not existing_task:
+        if await processor.process_wiki(
             request.organization,
             request.project,
             request.wikiIdentifier,
             request.max_concurrent_requests,
-        )
-        return {
-            "status": "started",
-            "task_id": task_id,
-            "message": "Wiki processing started",
+        ):
+            return ORJSONResponse(
+                content={
+                    "status": "started",
+                    "task_id": task_id,
+                    "message": "Wiki processing started",
+                }
+            )
+
+        # Another request registered the wiki in the meantime
+        existing_task = await _get_existing_task(processor.database, task_id, request)
+
+    return ORJSONResponse(
+        content={
+            "status": existing_task["status"],
+            "task_id": existing_task["task_id"],
+            "message": "Wiki is already being processed or processed",
         }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
-        )
+    )
 
 
-@router.get("/status/{task_id}", response_model=ProcessingStatusResponse)
-async def get_processing_status(
-    task_id: str, database: DatabaseService = Depends(get_database)
-) -> ProcessingStatusResponse:
-    """
-    Get detailed processing status for frontend tracking.
-    """
-    logger.info(f"Getting status for task: {task_id}")
-    task = database.get_wiki_task(task_id)
-    if not task:
-        logger.error(f"Task not found: {task_id}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
-        )
-
-    # logger.info(f"Found task status: {task['status']}")
-    return ProcessingStatusResponse(
-        status=task["status"]["status"].value,
-        total_pages=task["status"]["total_pages"],
-        processed_pages=task["status"]["processed_pages"],
-        remaining_pages=task["status"]["remaining_pages"],
-        failed_pages=task["status"]["failed_pages"],
-        current_page=task["status"]["current_page"],
-        percent_complete=task["status"]["percent_complete"],
-        error=task["status"]["error"],
-    )
+# Batch and single task status endpoints, shared with the website router
+status_routes = TaskStatusRoutes(
+    ProcessingStatusResponse,
+    DatabaseService.get_wiki_task,
+    DatabaseService.get_wiki_tasks,
+)
+status_routes.register(router)
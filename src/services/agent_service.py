@@ -1,6 +1,11 @@
-from typing import Annotated, AsyncGenerator, List, Sequence
+import asyncio
+import os
+from typing import Annotated, AsyncGenerator, List, Optional, Sequence
 
+import aiofiles
+import cachetools
 from langchain_core.documents import Document
+from langchain_core.messages import SystemMessage
 from langchain_core.runnables import RunnableConfig
 from langchain_groq import ChatGroq
 from langchain_ollama import ChatOllama
@@ -11,14 +16,87 @@ from langgraph.graph import END, START, StateGraph
 from langgraph.graph.message import BaseMessage, add_messages
 from typing_extensions import TypedDict
 
-from src.utils.dependency import get_indexer
+from src.utils.dependency import get_indexer, get_llm_http_client
 from src.utils.logger import logger
+from src.utils.query_cache import SemanticQueryCache, unit_vector
+
+# Number of documents retrieved as context for a question
+RETRIEVAL_K = 7
+
+# Follow-up questions at least this similar to the question that last
+# retrieved documents in the same conversation reuse its documents
+FOLLOW_UP_SIMILARITY = 0.9
+
+# Conversations whose last retrieval is remembered, and for how long
+THREAD_DOCS_CACHE_SIZE = 1024
+THREAD_DOCS_TTL = 300
+
+# Concurrent LLM calls per worker, sized to the Groq account's rate limits so
+# bursts queue here instead of failing with 429s and retrying
+GROQ_MAX_CONCURRENCY = int(os.getenv("GROQ_MAX_CONCURRENCY", "8"))
+
+# Reasoning models wrap their chain of thought in these tags, it is not streamed
+THINK_OPEN = "<think>"
+THINK_CLOSE = "</think>"
+
+# Streamed tokens are sent once this many characters are buffered, or when
+# this many seconds passed since the last chunk, whichever comes first
+STREAM_FLUSH_CHARS = 64
+STREAM_FLUSH_INTERVAL = 0.05
+
+# System prompt sent with the retrieved documents, only the context changes per turn
+SYSTEM_PROMPT_TEMPLATE = """You are a knowledgeable and precise assistant. Follow these guidelines:
+
+1. Knowledge Synthesis:
+   - For general questions: Provide accurate, concise answers based on your knowledge
+   - For specific queries: Analyze and incorporate the following context:
+   {context}
+
+2. Response Structure:
+   - Start with the most relevant information
+   - Support claims with specific examples or references from the context
+   - Use clear, professional language
+
+3. Quality Control:
+   - If the context is insufficient: Acknowledge limitations and request clarification
+   - If uncertain: State your confidence level and what you know for sure
+   - Avoid speculation and clearly distinguish between facts and interpretations
+
+Remember to be direct, accurate, and focused on addressing the user's specific needs.
+Keep the responses short and sweet.
+IMPORTANT: if you dont know the answer just say don't know. NO other reasons."""
+
+
+# Messages kept in a conversation's checkpoint. The chatbot only sends the
+# last 4 to the model, older ones would just grow every checkpoint.
+MAX_HISTORY_MESSAGES = 8
+
+
+def _last_system_message(messages: Sequence[BaseMessage]) -> Optional[BaseMessage]:
+    return next((m for m in reversed(messages) if isinstance(m, SystemMessage)), None)
+
+
+def add_recent_messages(
+    left: Sequence[BaseMessage], right: Sequence[BaseMessage]
+) -> List[BaseMessage]:
+    """
+    Merge new messages like add_messages, keeping only the most recent ones.
+
+    A system message is only added when the retrieved context changes, so the
+    latest one is kept even once it is older than the other kept messages.
+    """
+    merged = add_messages(left, right)
+    recent = merged[-MAX_HISTORY_MESSAGES:]
+    system = _last_system_message(merged)
+    if system is not None and system not in recent:
+        recent = [system, *recent[1:]]
+    return recent
 
 
 # Define the structure of the state that the graph will use.
 class State(TypedDict):
-    # The "messages" key holds a list of conversation messages.
-    messages: Annotated[Sequence[BaseMessage], add_messages]
+    # The "messages" key holds a list of the latest conversation messages.
+    messages: Annotated[Sequence[BaseMessage], add_recent_messages]
 
 
 class AgentService:
@@ -32,6 +110,13 @@ class AgentService:
         # Initialize the vector store indexer dependency.
         self.indexer = get_indexer()
 
+        # Documents retrieved for recent questions, reused for repeats.
+        self.retrieval_cache = SemanticQueryCache()
+        # Embedding of the question and documents last retrieved per conversation.
+        self.thread_docs = cachetools.TTLCache(
+            maxsize=THREAD_DOCS_CACHE_SIZE, ttl=THREAD_DOCS_TTL
+        )
+
         # Set up a memory saver for checkpointing the state graph.
         self.memory = MemorySaver()
 
@@ -40,21 +125,31 @@ class AgentService:
 
         # Initialize the language model instance.
         # self.llm = ChatOllama(model="deepseek-r1:14b")
-        self.llm = ChatGroq(model="deepseek-r1-distill-llama-70b")
+        self.llm = ChatGroq(
+            model="deepseek-r1-distill-llama-70b",
+            http_async_client=get_llm_http_client(),
+        )
         # self.llm = ChatOllama(model="llama3.2")
 
+        # Bound the LLM calls in flight across all conversations.
+        self.llm_semaphore = asyncio.Semaphore(GROQ_MAX_CONCURRENCY)
+
         # Define the chatbot node function for the graph.
         async def chatbot_node(state: State) -> State:
             """
             Node function that invokes the language model using the provided conversation messages.
             It takes the current state, calls the LLM with the messages, and returns the updated state.
             """
-            logger.info(
-                f"Invoking LLM in chatbot node with state messages.\n\n {state['messages'][-4:]} \n\n"
-            )
+            # Send the latest system message first, then the recent conversation.
+            system = _last_system_message(state["messages"])
+            conversation = [
+                m for m in state["messages"] if not isinstance(m, SystemMessage)
+            ][-3:]
+            prompt = [system, *conversation] if system else conversation
+            logger.debug("Invoking LLM in chatbot node with messages: %s", prompt)
             # Call the LLM synchronously using the current conversation messages.
-            # logger.info(f"Message sent to model: {state['messages'][-3:]}")
-            response = await self.llm.ainvoke(state["messages"][-4:])
+            async with self.llm_semaphore:
+                response = await self.llm.ainvoke(prompt)
             # Return the response wrapped in a dictionary under "messages".
             return {"messages": [response]}
 
@@ -67,49 +162,68 @@ class AgentService:
         # Compile the state graph with the memory checkpoint.
         self.graph = self.graph_builder.compile(checkpointer=self.memory)
 
-    async def _retrieve_docs(self, query: str) -> List[Document]:
+    async def _retrieve_docs(self, query: str, thread_id: str) -> List[Document]:
         """
         Retrieve documents relevant to the user query using the vector store retriever.
 
+        The query is embedded once and reused for the cache lookups and the
+        similarity search. Repeated and near-identical questions are answered
+        from the cache, and follow-up questions in the same conversation reuse
+        its last documents until the topic drifts.
+
         Args:
             query (str): The user's query string.
+            thread_id (str): The conversation the query belongs to.
 
         Returns:
             List[Document]: A list of retrieved Document objects.
         """
-        logger.info(f"Retrieving documents for query: {query}")
+        logger.info("Retrieving documents for query: %s", query)
 
-        # Define search parameters (for example, retrieve the top 5 relevant docs).
-        search_kwargs = {"k": 7}
+        # Exact repeats skip the embedding call entirely.
+        if (docs := self.retrieval_cache.get(query)) is not None:
+            logger.info("Reusing cached documents for query: %s", query)
+            return docs
 
         # Ensure that the vector store has been initialized.
         if not self.indexer.vector_store:
             raise RuntimeError("Vector store not initialized.")
 
-        # Create a retriever from the vector store using similarity search.
-        retriever = self.indexer.vector_store.as_retriever(
-            search_type="similarity", search_kwargs=search_kwargs
+        embedding = await self.indexer.embedding_model.aembed_query(query)
+        vector = unit_vector(embedding)
+        previous = self.thread_docs.get(thread_id)
+        if previous is not None and previous[0] @ vector >= FOLLOW_UP_SIMILARITY:
+            logger.info("Reusing conversation documents for follow-up: %s", query)
+            return previous[1]
+
+        if (docs := self.retrieval_cache.get_similar(embedding)) is not None:
+            logger.info("Reusing documents of a similar query for: %s", query)
+            self.thread_docs[thread_id] = (vector, docs)
+            return docs
+
+        # Retrieve the top documents for the given query.
+        docs = await self.indexer.vector_store.asimilarity_search_by_vector(
+            embedding, k=RETRIEVAL_K
         )
-
-        # Retrieve documents for the given query.
-        docs = await retriever.ainvoke(query)
-        logger.info(docs)
-
-        for i, doc in enumerate(docs):
-            with open("full-content.txt", "a") as file:
-                file.write(
+        self.retrieval_cache.put(query, embedding, docs)
+        self.thread_docs[thread_id] = (vector, docs)
+        logger.debug("Retrieved documents: %s", docs)
+
+        # Dump the retrieved context in a single write, off the event loop
+        async with aiofiles.open("full-content.txt", "a") as file:
+            await file.write(
+                "".join(
                     f"----------Documument {i}---------------------\n {doc.page_content}\n"
+                    for i, doc in enumerate(docs)
                 )
-            # logger.info(
-            #     f"----------Documument {i}---------------------\n {doc.page_content}"
-            # )
+            )
 
-        logger.info(f"Retrieved {len(docs)} documents for query: {query}")
+        logger.info("Retrieved %d documents for query: %s", len(docs), query)
         return docs
 
     async def stream_response(
         self, user_input: str, user_id: str
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[bytes, None]:
         """
         Asynchronously streams the LLM's response from the state graph based on the user's input.
         It first retrieves relevant documents, builds the conversation context, and then streams
@@ -119,40 +233,26 @@ class AgentService:
             user_input (str): The user's input query.
 
         Yields:
-            str: Chunks of the response content as they are generated.
+            bytes: UTF-8 encoded chunks of the response content as they are generated.
         """
         # Retrieve documents that are relevant to the user query.
-        docs = await self._retrieve_docs(user_input)
+        docs = await self._retrieve_docs(user_input, user_id)
+
+        # Define a configuration for the graph execution.
+        config: RunnableConfig = {"configurable": {"thread_id": user_id}}
 
         # Start building the conversation messages.
         messages = []
         if docs:
             # Combine the retrieved document contents to form context
             context = "\n\n".join([doc.page_content for doc in docs])
-            system_message = {
-                "role": "system",
-                "content": f"""You are a knowledgeable and precise assistant. Follow these guidelines:
-
-                1. Knowledge Synthesis:
-                   - For general questions: Provide accurate, concise answers based on your knowledge
-                   - For specific queries: Analyze and incorporate the following context:
-                   {context}
-
-                2. Response Structure:
-                   - Start with the most relevant information
-                   - Support claims with specific examples or references from the context
-                   - Use clear, professional language
-
-                3. Quality Control:
-                   - If the context is insufficient: Acknowledge limitations and request clarification
-                   - If uncertain: State your confidence level and what you know for sure
-                   - Avoid speculation and clearly distinguish between facts and interpretations
-
-                Remember to be direct, accurate, and focused on addressing the user's specific needs.
-                Keep the responses short and sweet.
-                IMPORTANT: if you dont know the answer just say don't know. NO other reasons.""",
-            }
-            messages.append(system_message)
+            system_prompt = SYSTEM_PROMPT_TEMPLATE.format(context=context)
+            # The checkpoint already holds the system message if the context
+            # did not change since the last turn
+            snapshot = await self.graph.aget_state(config)
+            system = _last_system_message(snapshot.values.get("messages", []))
+            if system is None or system.content != system_prompt:
+                messages.append({"role": "system", "content": system_prompt})
 
         # Append the user's input message.
         messages.append({"role": "user", "content": user_input})
@@ -160,21 +260,35 @@ class AgentService:
         # Initialize the state for the LangGraph with the conversation messages.
         state: State = {"messages": messages}
 
-        # Define a configuration for the graph execution.
-        config: RunnableConfig = {"configurable": {"thread_id": user_id}}
-
         logger.info("Starting to stream response from the state graph.")
 
         # Stream the response asynchronously using the state graph's astream method.
-        think_tag_open = False
+        # Tokens are coalesced so the response sends fewer, larger chunks.
+        loop = asyncio.get_running_loop()
+        buffer: List[str] = []
+        buffered = 0
+        # The first visible token is sent right away
+        flush_at = loop.time()
+        thinking = False
         async for msg, metadata in self.graph.astream(
             state, config, stream_mode="messages"
         ):
-            # If the streamed message has content, yield it.
-            if msg.content == "<think>":
-                think_tag_open = True
-            elif msg.content == "</think>":
-                think_tag_open = False
-            elif not think_tag_open:
-                # print(msg.content)
-                yield msg.content
+            content = msg.content
+            if not content:
+                continue
+            if content == THINK_OPEN:
+                thinking = True
+            elif content == THINK_CLOSE:
+                thinking = False
+            elif not thinking:
+                buffer.append(content)
+                buffered += len(content)
+                if buffered >= STREAM_FLUSH_CHARS or loop.time() >= flush_at:
+                    # Pre-encode so the streaming response can send the chunk as is
+                    yield "".join(buffer).encode()
+                    buffer.clear()
+                    buffered = 0
+                    flush_at = loop.time() + STREAM_FLUSH_INTERVAL
+
+        if buffer:
+            yield "".join(buffer).encode()
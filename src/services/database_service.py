@@ -1,13 +1,61 @@
 import logging
 import sqlite3
+from contextlib import closing
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiosqlite
+import orjson
+from cachetools import TTLCache
 
 from src.types.website import ProcessingStatus, TaskStatus
 from src.types.wiki import TaskInfo
+from src.utils.sqlite_pool import SQLiteConnectionPool
 
 logger = logging.getLogger(__name__)
 
+# Status lookups are cached briefly, so frontends polling at 1-2 Hz mostly
+# skip SQLite. Writes in this process invalidate the affected entries, the
+# TTL bounds staleness for writes made by other workers.
+TASK_CACHE_SIZE = 1024
+TASK_CACHE_TTL = 1.0
+
+# Columns read by the full-row getters, in table order
+WEBSITE_TASK_COLUMNS = (
+    "task_id, url, status, total_urls, processed_urls, remaining_urls, "
+    "failed_urls, current_url, percent_complete, error, created_at, updated_at"
+)
+WIKI_TASK_COLUMNS = (
+    "task_id, organization, project, wiki_identifier, status, total_pages, "
+    "processed_pages, remaining_pages, failed_pages, current_page, "
+    "percent_complete, error, created_at, updated_at"
+)
+
+
+def _encode_list(values: List[str]) -> str:
+    """Encode a list column as a JSON array, which keeps commas in URLs intact."""
+    return orjson.dumps(values).decode()
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time, formatted like sqlite3's datetime adapter so rows parse alike."""
+    return datetime.utcnow().isoformat(sep=" ")
+
+
+def _decode_list(value: Optional[str]) -> List[str]:
+    """Decode a list column, rows from older releases hold comma separated values."""
+    if not value:
+        return []
+    if value.startswith("["):
+        return orjson.loads(value)
+    return value.split(",")
+
+
+# Page cache per connection, negative values are in KiB (64 MiB)
+SQLITE_CACHE_SIZE = -64000
+# Milliseconds a connection waits on a locked database before failing
+SQLITE_BUSY_TIMEOUT = 5000
+
 
 class DatabaseService:
     """"""
@@ -15,6 +63,15 @@ class DatabaseService:
     def __init__(self):
         self._db_path = "data/rag.db"
         self.is_initialized: bool = False
+        # Warm connections reused by the async lookups
+        self.pool = SQLiteConnectionPool(self._connect)
+        # Lookup caches, only found tasks are cached
+        self._task_cache = TTLCache(maxsize=TASK_CACHE_SIZE, ttl=TASK_CACHE_TTL)
+        self._task_by_url_cache = TTLCache(maxsize=TASK_CACHE_SIZE, ttl=TASK_CACHE_TTL)
+        self._wiki_task_cache = TTLCache(maxsize=TASK_CACHE_SIZE, ttl=TASK_CACHE_TTL)
+        self._wiki_task_by_details_cache = TTLCache(
+            maxsize=TASK_CACHE_SIZE, ttl=TASK_CACHE_TTL
+        )
 
         self.initialize()
 
@@ -28,8 +85,43 @@ class DatabaseService:
         """"""
         return sqlite3.connect(self._db_path)
 
+    async def _connect(self) -> aiosqlite.Connection:
+        """Open a pooled connection, configured once for its lifetime."""
+        conn = await aiosqlite.connect(self._db_path)
+        # Rows are read by column name
+        conn.row_factory = aiosqlite.Row
+        await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        # Keep temporary tables and sort buffers off disk
+        await conn.execute("PRAGMA temp_store=MEMORY")
+        await conn.execute(f"PRAGMA cache_size={SQLITE_CACHE_SIZE}")
+        await conn.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT}")
+        return conn
+
+    async def close(self) -> None:
+        """Close the pooled connections."""
+        await self.pool.close()
+
+    def _invalidate_task(self, task_id: str) -> None:
+        """Drop the cached lookups of a website task."""
+        self._task_cache.pop(task_id, None)
+        for url, task in list(self._task_by_url_cache.items()):
+            if task["task_id"] == task_id:
+                self._task_by_url_cache.pop(url, None)
+
+    def _invalidate_wiki_task(self, task_id: str) -> None:
+        """Drop the cached lookups of a wiki task."""
+        self._wiki_task_cache.pop(task_id, None)
+        for details, task in list(self._wiki_task_by_details_cache.items()):
+            if task["task_id"] == task_id:
+                self._wiki_task_by_details_cache.pop(details, None)
+
     def _initialize_tables(self):
-        with self.get_connection() as conn:
+        # The connection's context manager only commits, closing() releases it
+        with closing(self.get_connection()) as conn, conn:
+            # WAL is persisted in the file, so the database is created in WAL
+            # mode before any pooled connection opens it
+            conn.execute("PRAGMA journal_mode=WAL")
             cur = conn.cursor()
             cur.execute("""
                 CREATE TABLE IF NOT EXISTS website_tasks(
@@ -48,6 +140,13 @@ class DatabaseService:
                 )
             """)
 
+            # Every website POST looks its URL up, keep that an index probe.
+            # Not unique, databases from older releases may hold duplicates.
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_website_tasks_url
+                ON website_tasks(url)
+            """)
+
             cur.execute("""
                 CREATE TABLE IF NOT EXISTS wiki_tasks(
                     task_id TEXT PRIMARY KEY,
@@ -67,41 +166,100 @@ class DatabaseService:
                 )
             """)
 
-    def add_task(self, task_id: str, url: str, status: str) -> None:
+            # Every wiki POST looks its details up. The organization is
+            # matched case-insensitively, the index has to collate the same.
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_wiki_tasks_details
+                ON wiki_tasks(organization COLLATE NOCASE, project, wiki_identifier)
+            """)
+
+    @staticmethod
+    def _website_task_from_row(row: aiosqlite.Row) -> Dict[str, Any]:
+        """Build a website task dict from a website_tasks row."""
+        return {
+            "task_id": row["task_id"],
+            "url": row["url"],
+            "status": {
+                "status": TaskStatus(row["status"]),
+                "total_urls": row["total_urls"],
+                "processed_urls": _decode_list(row["processed_urls"]),
+                "remaining_urls": _decode_list(row["remaining_urls"]),
+                "failed_urls": _decode_list(row["failed_urls"]),
+                "current_url": row["current_url"],
+                "percent_complete": row["percent_complete"],
+                "error": row["error"],
+            },
+            "created_at": datetime.fromisoformat(row["created_at"]),
+            "updated_at": datetime.fromisoformat(row["updated_at"]),
+        }
+
+    @staticmethod
+    def _wiki_task_from_row(row: aiosqlite.Row) -> Dict[str, Any]:
+        """Build a wiki task dict from a wiki_tasks row."""
+        return {
+            "task_id": row["task_id"],
+            "organization": row["organization"],
+            "project": row["project"],
+            "wiki_identifier": row["wiki_identifier"],
+            "status": {
+                "status": TaskStatus(row["status"]),
+                "total_pages": row["total_pages"],
+                "processed_pages": _decode_list(row["processed_pages"]),
+                "remaining_pages": _decode_list(row["remaining_pages"]),
+                "failed_pages": _decode_list(row["failed_pages"]),
+                "current_page": row["current_page"],
+                "percent_complete": row["percent_complete"],
+                "error": row["error"],
+            },
+            "created_at": datetime.fromisoformat(row["created_at"]),
+            "updated_at": datetime.fromisoformat(row["updated_at"]),
+        }
+
+    async def add_task(self, task_id: str, url: str, status: str) -> None:
         """Add a basic task record (used by website route)"""
-        with self.get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute(
+        await self.add_tasks([(task_id, url, status)])
+
+    async def add_tasks(self, tasks: List[Tuple[str, str, str]]) -> None:
+        """
+        Add several basic task records in a single transaction.
+
+        Args:
+            tasks (List[Tuple[str, str, str]]): Task ID, URL and status of
+                each task
+        """
+        now = _utc_timestamp()
+        async with self.pool.writer() as conn:
+            await conn.executemany(
                 """INSERT INTO website_tasks 
                 (task_id, url, status, total_urls, processed_urls, remaining_urls,
                 failed_urls, current_url, percent_complete, error, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    task_id,
-                    url,
-                    status,
-                    0,  # total_urls
-                    "",  # processed_urls
-                    "",  # remaining_urls
-                    "",  # failed_urls
-                    None,  # current_url
-                    0,  # percent_complete
-                    None,  # error
-                    datetime.utcnow(),
-                    datetime.utcnow(),
-                ),
+                VALUES (?, ?, ?, 0, '', '', '', NULL, 0, NULL, ?, ?)""",
+                [(task_id, url, status, now, now) for task_id, url, status in tasks],
             )
+            await conn.commit()
+        for task_id, _, _ in tasks:
+            self._invalidate_task(task_id)
 
-    def create_processing_task(self, task_id: str, url: str) -> None:
-        """Create a full processing task record (used by website service)"""
+    async def create_processing_task(self, task_id: str, url: str) -> bool:
+        """
+        Create a full processing task record (used by website service).
+
+        The insert is skipped when the URL already has a task, in a single
+        statement so concurrent requests (from any worker) cannot both
+        register the same URL.
+
+        Returns:
+            bool: Whether the task was created
+        """
         status = ProcessingStatus()
-        with self.get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute(
+        now = _utc_timestamp()
+        async with self.pool.writer() as conn:
+            cur = await conn.execute(
                 """INSERT INTO website_tasks 
                 (task_id, url, status, total_urls, processed_urls, remaining_urls, 
                 failed_urls, current_url, percent_complete, error, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                SELECT ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+                WHERE NOT EXISTS (SELECT 1 FROM website_tasks WHERE url = ?)""",
                 (
                     task_id,
                     url,
@@ -113,15 +271,17 @@ class DatabaseService:
                     status.current_url,
                     status.percent_complete,
                     status.error,
-                    datetime.utcnow(),
-                    datetime.utcnow(),
+                    now,
+                    now,
+                    url,
                 ),
             )
+            await conn.commit()
+            return cur.rowcount == 1
 
-    def update_task_status(self, task_id: str, status: ProcessingStatus) -> None:
-        with self.get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute(
+    async def update_task_status(self, task_id: str, status: ProcessingStatus) -> None:
+        async with self.pool.writer() as conn:
+            await conn.execute(
                 """UPDATE website_tasks 
                 SET status = ?, total_urls = ?, processed_urls = ?, remaining_urls = ?,
                 failed_urls = ?, current_url = ?, percent_complete = ?, error = ?,
@@ -130,60 +290,97 @@ class DatabaseService:
                 (
                     status.status.value,
                     status.total_urls,
-                    ",".join(status.processed_urls),
-                    ",".join(status.remaining_urls),
-                    ",".join(status.failed_urls),
+                    _encode_list(status.processed_urls),
+                    _encode_list(status.remaining_urls),
+                    _encode_list(status.failed_urls),
                     status.current_url,
                     status.percent_complete,
                     status.error,
-                    datetime.utcnow(),
+                    _utc_timestamp(),
                     task_id,
                 ),
             )
+            await conn.commit()
+        self._invalidate_task(task_id)
 
-    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
-        with self.get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT * FROM website_tasks WHERE task_id = ?", (task_id,))
-            row = cur.fetchone()
+    async def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        if task := self._task_cache.get(task_id):
+            return task
+
+        async with self.pool.connection() as conn:
+            async with conn.execute(
+                f"SELECT {WEBSITE_TASK_COLUMNS} FROM website_tasks WHERE task_id = ?",
+                (task_id,),
+            ) as cur:
+                row = await cur.fetchone()
             if not row:
                 return None
 
-            return {
-                "task_id": row[0],
-                "url": row[1],
-                "status": {
-                    "status": TaskStatus(row[2]),
-                    "total_urls": row[3],
-                    "processed_urls": row[4].split(",") if row[4] else [],
-                    "remaining_urls": row[5].split(",") if row[5] else [],
-                    "failed_urls": row[6].split(",") if row[6] else [],
-                    "current_url": row[7],
-                    "percent_complete": row[8],
-                    "error": row[9],
-                },
-                "created_at": datetime.fromisoformat(row[10]),
-                "updated_at": datetime.fromisoformat(row[11]),
-            }
-
-    def get_task_by_url(self, url: str) -> Optional[Dict[str, Any]]:
-        with self.get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT * FROM website_tasks WHERE url = ?", (url,))
-            row = cur.fetchone()
+            task = self._task_cache[task_id] = self._website_task_from_row(row)
+            return task
+
+    async def get_tasks(self, task_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get several website tasks, fetching the uncached ones in one query.
+
+        Args:
+            task_ids (List[str]): IDs of the tasks to look up
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Found tasks keyed by task ID
+        """
+        tasks = {}
+        missing = []
+        for task_id in task_ids:
+            if task := self._task_cache.get(task_id):
+                tasks[task_id] = task
+            else:
+                missing.append(task_id)
+
+        if missing:
+            placeholders = ", ".join("?" * len(missing))
+            async with self.pool.connection() as conn:
+                async with conn.execute(
+                    f"SELECT {WEBSITE_TASK_COLUMNS} FROM website_tasks "
+                    f"WHERE task_id IN ({placeholders})",
+                    missing,
+                ) as cur:
+                    rows = await cur.fetchall()
+            for row in rows:
+                task_id = row["task_id"]
+                task = self._task_cache[task_id] = self._website_task_from_row(row)
+                tasks[task_id] = task
+
+        return tasks
+
+    async def get_task_by_url(self, url: str) -> Optional[Dict[str, Any]]:
+        if task := self._task_by_url_cache.get(url):
+            return task
+
+        async with self.pool.connection() as conn:
+            async with conn.execute(
+                "SELECT task_id, url, status FROM website_tasks WHERE url = ?", (url,)
+            ) as cur:
+                row = await cur.fetchone()
             if not row:
                 return None
 
-            return {"task_id": row[0], "url": row[1], "status": row[2]}
+            task = self._task_by_url_cache[url] = dict(row)
+            return task
 
-    def create_wiki_task(
+    async def create_wiki_task(
         self, task_id: str, organization: str, project: str, wiki_identifier: str
-    ) -> None:
-        """Create a new wiki processing task"""
-        with self.get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                """INSERT INTO wiki_tasks 
+    ) -> bool:
+        """
+        Create a new wiki processing task, unless one with the ID exists.
+
+        Returns:
+            bool: Whether the task was created
+        """
+        now = _utc_timestamp()
+        async with self.pool.writer() as conn:
+            cur = await conn.execute(
+                """INSERT OR IGNORE INTO wiki_tasks 
                 (task_id, organization, project, wiki_identifier, status, total_pages,
                 processed_pages, remaining_pages, failed_pages, current_page,
                 percent_complete, error, created_at, updated_at)
@@ -201,16 +398,17 @@ class DatabaseService:
                     None,
                     0.0,
                     None,
-                    datetime.utcnow(),
-                    datetime.utcnow(),
+                    now,
+                    now,
                 ),
             )
+            await conn.commit()
+            return cur.rowcount == 1
 
-    def update_wiki_task(self, task_id: str, status: TaskInfo) -> None:
+    async def update_wiki_task(self, task_id: str, status: TaskInfo) -> None:
         """Update wiki task status"""
-        with self.get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute(
+        async with self.pool.writer() as conn:
+            await conn.execute(
                 """UPDATE wiki_tasks 
                 SET status = ?, total_pages = ?, processed_pages = ?, remaining_pages = ?,
                 failed_pages = ?, current_page = ?, percent_complete = ?, error = ?,
@@ -219,64 +417,96 @@ class DatabaseService:
                 (
                     status.status.value,
                     status.total_pages,
-                    ",".join(status.processed_pages),
-                    ",".join(status.remaining_pages),
-                    ",".join(status.failed_pages),
+                    _encode_list(status.processed_pages),
+                    _encode_list(status.remaining_pages),
+                    _encode_list(status.failed_pages),
                     status.current_page,
                     status.percent_complete,
                     status.error,
-                    datetime.utcnow(),
+                    _utc_timestamp(),
                     task_id,
                 ),
             )
+            await conn.commit()
+        self._invalidate_wiki_task(task_id)
 
-    def get_wiki_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+    async def get_wiki_task(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Get wiki task by ID"""
-        logger.info(f"Fetching wiki task from database: {task_id}")
-        with self.get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT * FROM wiki_tasks WHERE task_id = ?", (task_id,))
-            row = cur.fetchone()
+        if task := self._wiki_task_cache.get(task_id):
+            return task
+
+        logger.info("Fetching wiki task from database: %s", task_id)
+        async with self.pool.connection() as conn:
+            async with conn.execute(
+                f"SELECT {WIKI_TASK_COLUMNS} FROM wiki_tasks WHERE task_id = ?",
+                (task_id,),
+            ) as cur:
+                row = await cur.fetchone()
             if not row:
-                logger.error(f"No task found in database with ID: {task_id}")
+                logger.debug("No task found in database with ID: %s", task_id)
                 return None
 
-            logger.info(f"Found task in database: {row}")
-            return {
-                "task_id": row[0],
-                "organization": row[1],
-                "project": row[2],
-                "wiki_identifier": row[3],
-                "status": {
-                    "status": TaskStatus(row[4]),
-                    "total_pages": row[5],
-                    "processed_pages": row[6].split(",") if row[6] else [],
-                    "remaining_pages": row[7].split(",") if row[7] else [],
-                    "failed_pages": row[8].split(",") if row[8] else [],
-                    "current_page": row[9],
-                    "percent_complete": row[10],
-                    "error": row[11],
-                },
-                "created_at": datetime.fromisoformat(row[12]),
-                "updated_at": datetime.fromisoformat(row[13]),
-            }
-
-    def get_wiki_task_by_details(
+            task = self._wiki_task_cache[task_id] = self._wiki_task_from_row(row)
+            logger.debug("Found task in database: %s", task)
+            return task
+
+    async def get_wiki_tasks(self, task_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get several wiki tasks, fetching the uncached ones in one query.
+
+        Args:
+            task_ids (List[str]): IDs of the tasks to look up
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Found tasks keyed by task ID
+        """
+        tasks = {}
+        missing = []
+        for task_id in task_ids:
+            if task := self._wiki_task_cache.get(task_id):
+                tasks[task_id] = task
+            else:
+                missing.append(task_id)
+
+        if missing:
+            placeholders = ", ".join("?" * len(missing))
+            async with self.pool.connection() as conn:
+                async with conn.execute(
+                    f"SELECT {WIKI_TASK_COLUMNS} FROM wiki_tasks "
+                    f"WHERE task_id IN ({placeholders})",
+                    missing,
+                ) as cur:
+                    rows = await cur.fetchall()
+            for row in rows:
+                task_id = row["task_id"]
+                task = self._wiki_task_cache[task_id] = self._wiki_task_from_row(row)
+                tasks[task_id] = task
+
+        return tasks
+
+    async def get_wiki_task_by_details(
         self, organization: str, project: str, wiki_identifier: str
     ) -> Optional[Dict[str, Any]]:
-        """Get wiki task by organization, project and wiki identifier"""
-        with self.get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                """SELECT * FROM wiki_tasks 
-                WHERE organization = ? AND project = ? AND wiki_identifier = ?""",
+        """
+        Get wiki task by organization, project and wiki identifier.
+
+        The organization is matched case-insensitively, as it is lowercased
+        in the task ID.
+        """
+        details = (organization.lower(), project, wiki_identifier)
+        if task := self._wiki_task_by_details_cache.get(details):
+            return task
+
+        async with self.pool.connection() as conn:
+            async with conn.execute(
+                """SELECT task_id, status FROM wiki_tasks
+                WHERE organization = ? COLLATE NOCASE AND project = ?
+                AND wiki_identifier = ?""",
                 (organization, project, wiki_identifier),
-            )
-            row = cur.fetchone()
+            ) as cur:
+                row = await cur.fetchone()
             if not row:
                 return None
 
-            return {
-                "task_id": row[0],
-                "status": row[4],
-            }
+            task = self._wiki_task_by_details_cache[details] = dict(row)
+            return task
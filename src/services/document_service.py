@@ -1,16 +1,149 @@
 import asyncio
+import os
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Set, Tuple, Type, Union
 
 import aiofiles
+from fastapi import UploadFile
 from langchain_community.document_loaders import Docx2txtLoader, PyPDFLoader
+from langchain_core.document_loaders import BaseLoader
 from langchain_core.documents.base import Document
 
-from src.services.indexer_service import IndexerService
-from src.utils.dependency import get_indexer
+from src.services.indexer_service import get_worker_text_splitter
+from src.utils.concurrency import run_sync
+from src.utils.dependency import get_indexer, get_process_pool
 from src.utils.logger import logger
 
+# Size of the blocks copied from the upload into the temporary file
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# Maximum chunks embedded and written to the vector store per call, the
+# chunks of concurrently processed documents share batches
+DOCUMENT_INDEX_BATCH_SIZE = 256
+# Seconds a partial batch waits for chunks of other documents
+DOCUMENT_INDEX_MAX_DELAY = 0.1
+# Batches indexed at the same time, so one batch is written to the vector
+# store while the next one is embedded
+DOCUMENT_INDEX_CONCURRENCY = 2
+
+
+def _load_and_split(loader_class: Type[BaseLoader], file_path: str) -> List[Document]:
+    """
+    Parse a document file and split it into chunks.
+
+    Runs in a worker process of the shared process pool, so parsing and
+    splitting never hold the GIL of the event loop process. Arguments and
+    the result are picklable, the splitter is the worker's own.
+
+    Args:
+        loader_class (Type[BaseLoader]): Loader used to parse the file
+        file_path (str): Path to the document file
+
+    Returns:
+        List[Document]: The document chunks
+    """
+    documents = loader_class(file_path).load()
+    return get_worker_text_splitter().split_documents(documents)
+
+
+class ChunkBatcher:
+    """
+    Indexes the chunks of concurrently processed documents in shared batches.
+
+    Documents queue their chunks and wait for them to be indexed. A background
+    task collects queued chunks into batches of up to max_batch, waiting at
+    most max_delay for more, and adds each batch to the vector store with one
+    call, so small documents share an embedding round-trip and index write.
+
+    Attributes:
+        max_batch (int): Maximum number of chunks per batch
+        max_delay (float): Seconds a partial batch waits for more chunks
+    """
+
+    def __init__(
+        self,
+        max_batch: int = DOCUMENT_INDEX_BATCH_SIZE,
+        max_delay: float = DOCUMENT_INDEX_MAX_DELAY,
+        concurrency: int = DOCUMENT_INDEX_CONCURRENCY,
+    ) -> None:
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: asyncio.Queue[Tuple[List[Document], asyncio.Future]] = (
+            asyncio.Queue()
+        )
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._worker: Optional[asyncio.Task] = None
+        # Strong references, the event loop only keeps weak ones
+        self._flushes: Set[asyncio.Task] = set()
+
+    async def add(self, chunks: List[Document]) -> None:
+        """
+        Index document chunks, returning once all of them are in the vector store.
+
+        Args:
+            chunks (List[Document]): The document chunks to index
+        """
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        loop = asyncio.get_running_loop()
+        futures = []
+        for i in range(0, len(chunks), self.max_batch):
+            future = loop.create_future()
+            self._queue.put_nowait((chunks[i : i + self.max_batch], future))
+            futures.append(future)
+        await asyncio.gather(*futures)
+
+    async def _run(self) -> None:
+        """Collect queued chunks into batches and start indexing them."""
+        loop = asyncio.get_running_loop()
+        carried = None
+        while True:
+            item = carried or await self._queue.get()
+            carried = None
+            batch = [item]
+            size = len(item[0])
+            deadline = loop.time() + self.max_delay
+            while size < self.max_batch:
+                try:
+                    item = await asyncio.wait_for(
+                        self._queue.get(), deadline - loop.time()
+                    )
+                except asyncio.TimeoutError:
+                    break
+                if size + len(item[0]) > self.max_batch:
+                    carried = item
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            # Waits for a free slot, queued chunks keep collecting meanwhile
+            await self._semaphore.acquire()
+            flush = asyncio.create_task(self._flush(batch))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[Tuple[List[Document], asyncio.Future]]) -> None:
+        """Add a batch to the vector store and wake the documents it contains."""
+        try:
+            chunks = [chunk for chunks, _ in batch for chunk in chunks]
+            await run_sync(get_indexer().vector_store.add_documents, chunks)
+            logger.info("Indexed %d chunks of %d queued parts", len(chunks), len(batch))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+        finally:
+            self._semaphore.release()
+
+
+chunk_batcher = ChunkBatcher()
+
 
 class DocumentService:
     """Service class for handling concurrent document processing operations."""
@@ -28,42 +161,54 @@ class DocumentService:
             f"Supported file extensions: {', '.join(self.supported_extensions.keys())}"
         )
 
-    async def _create_document(self, file_path: str) -> List[Document]:
+    async def _create_chunks(self, file_path: str) -> List[Document]:
         """
-        Create document objects from the input file asynchronously.
+        Create document chunks from the input file asynchronously.
+
+        Parsing and splitting are CPU-bound, so they run in the shared
+        process pool instead of on the event loop.
 
         Args:
             file_path (str): Path to the document file
 
         Returns:
-            List[Document]: List of created document objects
+            List[Document]: List of document chunks
 
         Raises:
             ValueError: If file format is not supported
         """
-        logger.info(f"Creating document objects from file: {file_path}")
+        logger.info("Creating document chunks from file: %s", file_path)
 
-        extension = Path(file_path).suffix.lower().lstrip(".")
-        logger.debug(f"Detected file extension: {extension}")
+        extension = os.path.splitext(file_path)[1][1:].lower()
+        logger.debug("Detected file extension: %s", extension)
 
         if extension not in self.supported_extensions:
-            error_msg = (
+            supported = ", ".join(self.supported_extensions)
+            logger.error(
+                "Unsupported file format: %s. Supported formats are: %s",
+                extension,
+                supported,
+            )
+            raise ValueError(
                 f"Unsupported file format: {extension}. "
-                f"Supported formats are: {', '.join(self.supported_extensions.keys())}"
+                f"Supported formats are: {supported}"
             )
-            logger.error(error_msg)
-            raise ValueError(error_msg)
 
         loader_class = self.supported_extensions[extension]
-        logger.info(f"Using loader class: {loader_class.__name__}")
+        logger.info("Using loader class: %s", loader_class.__name__)
 
         try:
-            # Run document loading in a thread pool
-            documents = await asyncio.to_thread(loader_class(file_path).load)
-            logger.info(f"Successfully created {len(documents)} document objects")
-            return documents
+            loop = asyncio.get_running_loop()
+            chunks = await loop.run_in_executor(
+                get_process_pool(),
+                _load_and_split,
+                loader_class,
+                file_path,
+            )
+            logger.info("Successfully created %d document chunks", len(chunks))
+            return chunks
         except Exception as e:
-            logger.error(f"Failed to load document: {str(e)}")
+            logger.error("Failed to load document: %s", e)
             raise
 
     async def process_document(self, file_path: str) -> Dict[str, Union[str, int]]:
@@ -80,7 +225,7 @@ class DocumentService:
             RuntimeError: If indexer components are not properly initialized
         """
         async with self.semaphore:  # Limit concurrent processing
-            logger.info(f"Starting document processing for: {file_path}")
+            logger.info("Starting document processing for: %s", file_path)
 
             if not self.indexer.text_splitter or not self.indexer.vector_store:
                 error_msg = "Indexer components not properly initialized"
@@ -89,16 +234,10 @@ class DocumentService:
 
             try:
                 # Document processing pipeline with async operations
-                docs = await self._create_document(file_path)
-
-                logger.info("Splitting documents into chunks...")
-                chunks = await asyncio.to_thread(
-                    self.indexer.text_splitter.split_documents, docs
-                )
-                logger.info(f"Created {len(chunks)} chunks from the document")
+                chunks = await self._create_chunks(file_path)
 
                 logger.info("Adding chunks to vector store...")
-                await asyncio.to_thread(self.indexer.vector_store.add_documents, chunks)
+                await chunk_batcher.add(chunks)
                 logger.info("Successfully added chunks to vector store")
 
                 return {
@@ -109,21 +248,27 @@ class DocumentService:
                 }
 
             except Exception as e:
-                logger.error(f"Failed to process document: {str(e)}")
+                logger.error("Failed to process document: %s", e)
                 raise
 
 
 async def process_document(
-    content: bytes, file_name: str, content_type: str, indexer: IndexerService
+    upload: UploadFile,
+    file_name: str,
+    content_type: str,
+    document_service: DocumentService,
 ) -> Dict[str, Union[str, int]]:
     """
     Process a document with support for concurrent requests.
 
+    The upload is copied to a temporary file in fixed size blocks, so memory
+    usage stays bounded regardless of the document size.
+
     Args:
-        content (bytes): The file content
+        upload (UploadFile): The uploaded file to read the content from
         file_name (str): Original file name
         content_type (str): File content type
-        indexer (IndexerService): The indexer service instance
+        document_service (DocumentService): The shared document service
 
     Returns:
         Dict[str, Union[str, int]]: Processing result
@@ -131,20 +276,20 @@ async def process_document(
     Raises:
         RuntimeError: If document processing fails
     """
-    logger.info(f"Processing document: {file_name}")
-    document_service = DocumentService()
+    logger.info("Processing document: %s", file_name)
 
     if not file_name:
         raise ValueError("No file name provided.")
 
-    extension = Path(file_name).suffix
+    extension = os.path.splitext(file_name)[1]
 
     with NamedTemporaryFile(delete=False, suffix=extension) as temp_file:
         try:
-            # Write content to temporary file
+            # Stream the upload into the temporary file block by block
             async with aiofiles.open(temp_file.name, "wb") as temp_async_file:
-                await temp_async_file.write(content)
-            logger.debug(f"Temporary file created at: {temp_file.name}")
+                while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+                    await temp_async_file.write(chunk)
+            logger.debug("Temporary file created at: %s", temp_file.name)
 
             # Process the document
             result = await document_service.process_document(temp_file.name)
@@ -152,12 +297,11 @@ async def process_document(
             return result
 
         except Exception as e:
-            error_msg = f"Document processing failed: {str(e)}"
-            logger.error(error_msg)
-            raise RuntimeError(error_msg)
+            logger.error("Document processing failed for %s: %s", file_name, e)
+            raise RuntimeError(f"Document processing failed: {e}") from e
         finally:
             # Clean up temporary file
             try:
                 Path(temp_file.name).unlink()
             except Exception as e:
-                logger.error(f"Error cleaning up temporary file: {e}")
+                logger.error("Error cleaning up temporary file: %s", e)
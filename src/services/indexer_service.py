@@ -1,13 +1,117 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from chromadb.config import Settings
 from langchain_chroma import Chroma
+from langchain_core.embeddings import Embeddings
 from langchain_ollama import OllamaEmbeddings
 from langchain_text_splitters.character import RecursiveCharacterTextSplitter
+from pydantic import PrivateAttr
 
+from src.utils.embedding_cache import CachedEmbeddings, EmbeddingCache
 from src.utils.logger import logger
 
+# Persistent data of the service, the vector store and the embedding cache
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+
+EMBEDDING_MODEL = "nomic-embed-text"
+
+# Candidates explored by Chroma's HNSW index per query. Chroma defaults to 10,
+# barely above the number of documents retrieved, which costs recall.
+HNSW_SEARCH_EF = 64
+
+# Texts per embedding request, and requests in flight to the server across
+# all callers. Ollama serves parallel requests on separate slots
+# (OLLAMA_NUM_PARALLEL), while the inputs of a single request are embedded one
+# after the other.
+EMBED_BATCH_SIZE = 64
+EMBED_MAX_CONCURRENCY = 4
+
+
+# Splitter of a process pool worker, built on its first task
+_worker_text_splitter: Optional[RecursiveCharacterTextSplitter] = None
+
+
+def create_text_splitter() -> RecursiveCharacterTextSplitter:
+    """
+    Create the text splitter documents are chunked with before indexing.
+
+    Configuration:
+    - chunk_size: 1000 characters
+    - chunk_overlap: 200 characters
+    - separators: Various text separators for intelligent splitting
+
+    Returns:
+        RecursiveCharacterTextSplitter: The configured splitter
+    """
+    return RecursiveCharacterTextSplitter(
+        chunk_size=1000,
+        chunk_overlap=200,
+        length_function=len,
+        # Separators ordered by priority
+        separators=["\n\n", "\n", ".", "?", "!", " ", ""],
+    )
+
+
+def get_worker_text_splitter() -> RecursiveCharacterTextSplitter:
+    """
+    Get the text splitter of the current process pool worker.
+
+    Tasks sent to the process pool call this instead of receiving the
+    indexer's splitter, so it is not pickled along with every task.
+
+    Returns:
+        RecursiveCharacterTextSplitter: The worker's splitter
+    """
+    global _worker_text_splitter
+    if _worker_text_splitter is None:
+        _worker_text_splitter = create_text_splitter()
+    return _worker_text_splitter
+
+
+class ConcurrentOllamaEmbeddings(OllamaEmbeddings):
+    """
+    OllamaEmbeddings that embeds large inputs as concurrent batched requests.
+
+    The vector store calls embed_documents once with every chunk it adds, so
+    the chunks are split into batches of EMBED_BATCH_SIZE. Batches of every
+    caller, sync or async, run on one executor of EMBED_MAX_CONCURRENCY
+    threads, which caps the requests in flight to the server no matter how
+    many crawls and uploads embed at the same time. Embeddings are returned
+    in input order.
+    """
+
+    _executor: ThreadPoolExecutor = PrivateAttr(
+        default_factory=lambda: ThreadPoolExecutor(
+            max_workers=EMBED_MAX_CONCURRENCY, thread_name_prefix="embed"
+        )
+    )
+
+    def _batches(self, texts: List[str]) -> List[List[str]]:
+        return [
+            texts[i : i + EMBED_BATCH_SIZE]
+            for i in range(0, len(texts), EMBED_BATCH_SIZE)
+        ]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed search docs."""
+        results = self._executor.map(super().embed_documents, self._batches(texts))
+        return [embedding for result in results for embedding in result]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed search docs."""
+        loop = asyncio.get_running_loop()
+        embed = super().embed_documents
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(self._executor, embed, batch)
+                for batch in self._batches(texts)
+            )
+        )
+        return [embedding for result in results for embedding in result]
+
 
 class IndexerService:
     """
@@ -20,7 +124,7 @@ class IndexerService:
 
     Attributes:
         vector_store (Optional[Chroma]): Vector database for storing document embeddings
-        embedding_model (Optional[OllamaEmbeddings]): Model for generating document embeddings
+        embedding_model (Optional[Embeddings]): Model for generating document embeddings
         text_splitter (Optional[RecursiveCharacterTextSplitter]): Utility for splitting text into chunks
     """
 
@@ -35,7 +139,7 @@ class IndexerService:
         """
         # Initialize instance variables
         self.vector_store: Optional[Chroma] = None
-        self.embedding_model: Optional[OllamaEmbeddings] = None
+        self.embedding_model: Optional[Embeddings] = None
         self.text_splitter: Optional[RecursiveCharacterTextSplitter] = None
         self._is_initialized: bool = False
 
@@ -61,29 +165,23 @@ class IndexerService:
         """
         Initialize the embedding model using Ollama.
 
-        Uses the 'nomic-embed-text' model for generating document embeddings.
+        Uses the 'nomic-embed-text' model for generating document embeddings,
+        large inputs are embedded as concurrent batched requests. Document
+        embeddings are cached on disk by content hash, so unchanged content
+        is not embedded again when it is re-indexed.
         """
         logger.info("Setting up embedding model...")
-        self.embedding_model = OllamaEmbeddings(model="nomic-embed-text")
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        self.embedding_model = CachedEmbeddings(
+            ConcurrentOllamaEmbeddings(model=EMBEDDING_MODEL),
+            EmbeddingCache(DATA_DIR / "embedding_cache.db", EMBEDDING_MODEL),
+        )
         logger.info("Embedding model setup complete.")
 
     def _setup_text_splitter(self) -> None:
-        """
-        Initialize the text splitter with specific configuration.
-
-        Configuration:
-        - chunk_size: 1000 characters
-        - chunk_overlap: 200 characters
-        - separators: Various text separators for intelligent splitting
-        """
+        """Initialize the text splitter, configured by create_text_splitter."""
         logger.info("Setting up text splitter...")
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len,
-            # Separators ordered by priority
-            separators=["\n\n", "\n", ".", "?", "!", " ", ""],
-        )
+        self.text_splitter = create_text_splitter()
         logger.info("Text splitter setup complete.")
 
     def _setup_vector_store(self) -> None:
@@ -102,12 +200,11 @@ class IndexerService:
         """
         logger.info("Setting up vector store...")
 
-        # Get project root and create data directory
-        project_root = Path(__file__).parent.parent.parent
-        data_dir = project_root / "data" / "vector_store"
+        # Create the vector store directory in the data folder
+        data_dir = DATA_DIR / "vector_store"
         data_dir.mkdir(parents=True, exist_ok=True)
 
-        logger.info(f"Vector store directory: {data_dir}")
+        logger.info("Vector store directory: %s", data_dir)
 
         # Initialize Chroma with specific settings
         self.vector_store = Chroma(
@@ -117,5 +214,17 @@ class IndexerService:
                 anonymized_telemetry=False,  # Disable anonymous data collection
                 is_persistent=True,  # Enable persistence to disk
             ),
+            collection_metadata={"hnsw:search_ef": HNSW_SEARCH_EF},
         )
+
+        # The metadata above only applies to new collections, existing ones
+        # are updated before their index is loaded by the first query. Chroma
+        # rejects updates to collections with an explicit distance function.
+        collection = self.vector_store._collection
+        metadata = collection.metadata or {}
+        if (
+            metadata.get("hnsw:search_ef") != HNSW_SEARCH_EF
+            and "hnsw:space" not in metadata
+        ):
+            collection.modify(metadata={**metadata, "hnsw:search_ef": HNSW_SEARCH_EF})
         logger.info("Vector store setup complete.")
@@ -1,150 +1,310 @@
 import asyncio
 import hashlib
 import xml.etree.ElementTree as ET
-from typing import List
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Set, Tuple
 from urllib.parse import urljoin
 from uuid import uuid4
 
+import cachetools
 import httpx
-from langchain_community.document_loaders import WebBaseLoader
+from bs4 import BeautifulSoup
+from langchain_community.document_loaders.web_base import default_header_template
+from langchain_core.documents import Document
+from selectolax.lexbor import LexborHTMLParser
 
 from src.services.database_service import DatabaseService
-from src.services.indexer_service import IndexerService
+from src.services.indexer_service import IndexerService, get_worker_text_splitter
 from src.types.website import ProcessingStatus, TaskStatus
+from src.utils.concurrency import Throttle, crawl_admission, task_completions
+from src.utils.dependency import get_process_pool
 from src.utils.logger import logger
 
+# The event loop only keeps weak references to tasks, hold running crawls here
+# so they are not garbage collected before they finish
+_background_tasks: Set[asyncio.Task] = set()
+
+# Chunk hashes remembered per crawl for deduplication. Least recently seen
+# hashes are dropped first, boilerplate repeated on every page stays tracked.
+MAX_TRACKED_HASHES = 100_000
+
+# Fetched URL batches queued ahead of indexing, and the most URLs whose
+# chunks are added to the vector store in one call
+FETCH_QUEUE_SIZE = 4
+MAX_URLS_PER_INDEX = 64
+
+SITEMAP_LOC_TAG = "{http://www.sitemaps.org/schemas/sitemap/0.9}loc"
+
+
+def _parse_page(html: str, url: str) -> Document:
+    """
+    Extract the text and metadata of an HTML page.
+
+    Uses selectolax (lexbor) instead of BeautifulSoup with html.parser, which
+    parses typical pages several times faster with less memory. Metadata keys
+    match WebBaseLoader's.
+
+    Args:
+        html (str): The decoded page
+        url (str): URL of the page
+
+    Returns:
+        Document: The page text
+    """
+    tree = LexborHTMLParser(html)
+    metadata = {"source": url}
+    if title := tree.css_first("title"):
+        metadata["title"] = title.text()
+    if description := tree.css_first('meta[name="description"]'):
+        metadata["description"] = description.attributes.get(
+            "content", "No description found."
+        )
+    if root := tree.css_first("html"):
+        metadata["language"] = root.attributes.get("lang", "No language found.")
+    body = tree.body or tree.root
+    text = body.text(separator=" ") if body else ""
+    return Document(page_content=text, metadata=metadata)
+
+
+def _parse_and_split(html: str, url: str) -> List[Document]:
+    """
+    Parse a fetched page and split it into chunks.
+
+    Runs in a worker process of the shared process pool, so HTML parsing
+    never holds the GIL of the event loop process and pages of concurrent
+    fetches are parsed on separate cores. Arguments and the result are
+    picklable, the splitter is the worker's own. XML documents keep going through BeautifulSoup, like
+    WebBaseLoader does.
+
+    Args:
+        html (str): The decoded page
+        url (str): URL of the page
+
+    Returns:
+        List[Document]: The page chunks
+    """
+    if url.endswith(".xml"):
+        soup = BeautifulSoup(html, "xml")
+        document = Document(page_content=soup.get_text(), metadata={"source": url})
+    else:
+        document = _parse_page(html, url)
+    return get_worker_text_splitter().split_documents([document])
+
 
 class WebsiteService:
     def __init__(
         self,
         indexer: IndexerService,
         database: DatabaseService,
+        http_client: httpx.AsyncClient,
         max_concurrent_requests: int = 10,
         connection_timeout: int = 30,
     ):
         self.indexer = indexer
         self.database = database
+        self.http_client = http_client
         self.semaphore = asyncio.Semaphore(max_concurrent_requests)
+        # URLs fetched concurrently and indexed together in one vector store call
+        self.batch_size = max_concurrent_requests
         self.connection_timeout = connection_timeout
-        self.processed_hashes = set()
+        # Raw digests, half the size of their hex strings
+        self.processed_hashes: cachetools.LRUCache = cachetools.LRUCache(
+            maxsize=MAX_TRACKED_HASHES
+        )
 
-    def _get_content_hash(self, content: str) -> str:
-        """Generate a unique hash for content and URL combination."""
-        return hashlib.md5(f"{content}".encode()).hexdigest()
+    def _get_content_hash(self, content: str) -> bytes:
+        """Generate a unique hash for content, as a raw 16 byte digest."""
+        return hashlib.blake2b(content.encode(), digest_size=16).digest()
 
     async def _fetch_sitemap(self, base_url: str) -> List[str]:
         """Fetch and parse sitemap URLs."""
-        logger.info(f"Fetching sitemap for {base_url}")
+        logger.info("Fetching sitemap for %s", base_url)
         sitemap_url = urljoin(base_url, "sitemap.xml")
         try:
-            async with httpx.AsyncClient(timeout=self.connection_timeout) as client:
-                response = await client.get(sitemap_url)
+            # Parse the sitemap as it downloads, dropping each element once
+            # read, so large sitemaps never hold a full tree in memory
+            urls = []
+            parser = ET.XMLPullParser(events=("end",))
+            async with self.http_client.stream(
+                "GET", sitemap_url, timeout=self.connection_timeout
+            ) as response:
                 response.raise_for_status()
-
-            root = ET.fromstring(response.content)
-            urls = [
-                loc.text
-                for loc in root.findall(
-                    ".//{http://www.sitemaps.org/schemas/sitemap/0.9}loc"
-                )
-                if loc.text and not loc.text.endswith(".pdf")
-            ]
-            logger.info(f"Urls found {len(urls)}")
+                async for data in response.aiter_bytes():
+                    parser.feed(data)
+                    for _, elem in parser.read_events():
+                        if elem.tag == SITEMAP_LOC_TAG:
+                            loc = elem.text
+                            if loc and not loc.endswith(".pdf"):
+                                urls.append(loc)
+                        elem.clear()
+            parser.close()
+            logger.info("Urls found %d", len(urls))
             return urls
 
         except Exception as e:
-            logger.info(f"No sitemap found for {base_url}: {e}")
+            logger.info("No sitemap found for %s: %s", base_url, e)
             return [base_url]
 
-    async def _process_url(self, url: str, task_id: str) -> bool:
-        """Process a single URL with status updates and deduplication."""
+    async def _fetch_page(self, url: str) -> str:
+        """Download a page on the shared client, with WebBaseLoader's headers."""
+        response = await self.http_client.get(
+            url, headers=default_header_template, timeout=self.connection_timeout
+        )
+        response.raise_for_status()
+        return response.text
+
+    async def _load_url(self, url: str) -> Optional[List[Document]]:
+        """
+        Fetch and split a single URL, returning its not yet seen chunks.
+
+        Returns None when the page could not be loaded. A broken process pool
+        is raised instead, failing the whole task.
+        """
         try:
             async with self.semaphore:
-                logger.info(f"Processing URL: {url}")
-
-                # Update current URL in status
-                task = self.database.get_task(task_id)
-                if task:
-                    status = ProcessingStatus(
-                        total_urls=task["status"]["total_urls"],
-                        processed_urls=task["status"]["processed_urls"],
-                        remaining_urls=task["status"]["remaining_urls"],
-                        failed_urls=task["status"]["failed_urls"],
-                        current_url=url,
-                        percent_complete=task["status"]["percent_complete"],
-                        status=task["status"]["status"],
-                        error=task["status"]["error"],
-                    )
-                    self.database.update_task_status(task_id, status)
-
-                loader = WebBaseLoader(url)
-                docs = await asyncio.to_thread(loader.load)
-
-                if not docs:
-                    return False
-
-                chunks = self.indexer.text_splitter.split_documents(docs)
+                logger.debug("Processing URL: %s", url)
+
+                html = await self._fetch_page(url)
+                loop = asyncio.get_running_loop()
+                chunks = await loop.run_in_executor(
+                    get_process_pool(),
+                    _parse_and_split,
+                    html,
+                    url,
+                )
                 unique_chunks = []
 
                 for chunk in chunks:
                     chunk.metadata["source"] = url
                     content_hash = self._get_content_hash(chunk.page_content)
 
-                    if content_hash not in self.processed_hashes:
-                        self.processed_hashes.add(content_hash)
-                        chunk.metadata["content_hash"] = content_hash
+                    # Reading the entry marks the hash as recently seen
+                    if self.processed_hashes.get(content_hash) is None:
+                        self.processed_hashes[content_hash] = True
+                        chunk.metadata["content_hash"] = content_hash.hex()
                         unique_chunks.append(chunk)
 
-                if unique_chunks:
-                    await self.indexer.vector_store.aadd_documents(unique_chunks)
-                    logger.info(f"Added {len(unique_chunks)} for {url}")
-                return True
+                return unique_chunks
 
+        except BrokenProcessPool:
+            # Not a problem of this page, every later parse would fail as well
+            raise
         except Exception as e:
-            logger.error(f"Error processing URL {url}: {e}")
-            return False
+            logger.error("Error processing URL %s: %s", url, e)
+            return None
+
+    async def _fetch_batches(self, urls: List[str], queue: asyncio.Queue) -> None:
+        """
+        Producer: fetch URLs concurrently, one batch at a time, and queue the
+        results for indexing. A None sentinel marks the end of the crawl.
+        """
+        try:
+            for i in range(0, len(urls), self.batch_size):
+                batch = urls[i : i + self.batch_size]
+                results = await asyncio.gather(*(self._load_url(u) for u in batch))
+                await queue.put(list(zip(batch, results)))
+        finally:
+            await queue.put(None)
+
+    async def _index_batch(
+        self,
+        batch: List[Tuple[str, Optional[List[Document]]]],
+        status: ProcessingStatus,
+        task_id: str,
+        progress_writes: Throttle,
+    ) -> None:
+        """Consumer: add a fetched batch to the vector store in a single call."""
+        chunks = [chunk for _, url_chunks in batch for chunk in url_chunks or []]
+        indexed = True
 
-    async def process_website(self, url: str) -> str:
-        """Process website and return task ID for status tracking."""
+        if chunks:
+            try:
+                await self.indexer.vector_store.aadd_documents(chunks)
+                logger.info("Added %d chunks for %d URLs", len(chunks), len(batch))
+            except Exception as e:
+                logger.error("Error indexing batch: %s", e)
+                indexed = False
+
+        # Update status, one pass over the remaining URLs per batch
+        batch_urls = {url for url, _ in batch}
+        status.remaining_urls = [
+            url for url in status.remaining_urls if url not in batch_urls
+        ]
+        for url, url_chunks in batch:
+            if indexed and url_chunks is not None:
+                status.processed_urls.append(url)
+            else:
+                status.failed_urls.append(url)
+
+        status.current_url = status.remaining_urls[0] if status.remaining_urls else None
+        status.percent_complete = (len(status.processed_urls) / status.total_urls) * 100
+        if progress_writes.ready():
+            await self.database.update_task_status(task_id, status)
+
+    async def process_website(self, url: str) -> Optional[str]:
+        """
+        Process website and return task ID for status tracking.
+
+        Returns None, without starting anything, when the URL already has a
+        task in the database.
+        """
         task_id = str(uuid4())
-        self.database.create_processing_task(task_id, url)
-        asyncio.create_task(self._process_website_task(url, task_id))
+        if not await self.database.create_processing_task(task_id, url):
+            return None
+        task_completions.start(task_id)
+        task = asyncio.create_task(self._process_website_task(url, task_id))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
         return task_id
 
     async def _process_website_task(self, url: str, task_id: str) -> None:
         """Background task for website processing with status updates."""
+        # Tasks over the limit stay pending in the database until a slot frees up
+        try:
+            async with crawl_admission:
+                await self._run_website_task(url, task_id)
+        finally:
+            task_completions.finish(task_id)
+
+    async def _run_website_task(self, url: str, task_id: str) -> None:
+        """Crawl and index the website, recording progress in the database."""
         try:
             # Initialize status
             urls = await self._fetch_sitemap(url)
             status = ProcessingStatus(
                 total_urls=len(urls),
                 remaining_urls=urls.copy(),
+                current_url=urls[0] if urls else None,
                 status=TaskStatus.IN_PROGRESS,
             )
-            self.database.update_task_status(task_id, status)
-
-            # Process URLs
-            for url in urls:
-                success = await self._process_url(url, task_id)
-
-                # Update status
-                status.remaining_urls.remove(url)
-                if success:
-                    status.processed_urls.append(url)
-                else:
-                    status.failed_urls.append(url)
+            await self.database.update_task_status(task_id, status)
+            # Progress is written at most once per interval, batches can finish faster
+            progress_writes = Throttle()
 
-                status.percent_complete = (
-                    len(status.processed_urls) / status.total_urls
-                ) * 100
-                self.database.update_task_status(task_id, status)
+            # Fetch the next batch of URLs while the current one is indexed
+            queue: asyncio.Queue = asyncio.Queue(maxsize=FETCH_QUEUE_SIZE)
+            producer = asyncio.create_task(self._fetch_batches(urls, queue))
+            try:
+                fetching = True
+                while fetching and (batch := await queue.get()) is not None:
+                    # Batches fetched while the last one was indexed go into
+                    # the same vector store call
+                    while len(batch) < MAX_URLS_PER_INDEX and not queue.empty():
+                        if (more := queue.get_nowait()) is None:
+                            fetching = False
+                            break
+                        batch.extend(more)
+                    await self._index_batch(batch, status, task_id, progress_writes)
+                await producer
+            finally:
+                producer.cancel()
 
             # Complete status
             status.status = TaskStatus.COMPLETED
             status.current_url = None
-            self.database.update_task_status(task_id, status)
+            await self.database.update_task_status(task_id, status)
 
         except Exception as e:
-            logger.error(f"Website processing failed: {str(e)}")
+            logger.error("Website processing failed: %s", e)
             status = ProcessingStatus(status=TaskStatus.FAILED, error=str(e))
-            self.database.update_task_status(task_id, status)
+            await self.database.update_task_status(task_id, status)
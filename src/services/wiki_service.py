@@ -1,20 +1,34 @@
 import asyncio
+import hashlib
 import json
 import os
+import re
 from asyncio import Semaphore
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple
 
-import aiohttp
 import cachetools
-from aiohttp import ClientSession, TCPConnector
+import httpx
 from langchain_core.documents import Document
 
 from src.services.database_service import DatabaseService
 from src.services.indexer_service import IndexerService
+from src.utils.concurrency import Throttle, crawl_admission, task_completions
 from src.utils.logger import logger
 
+# The event loop only keeps weak references to tasks, hold running wiki
+# tasks here so they are not garbage collected before they finish
+_background_tasks: Set[asyncio.Task] = set()
+
+# Pages indexed per vector store call, large enough to amortize the
+# embedding request overhead
+WIKI_INDEX_BATCH_SIZE = 64
+
+# Fetched pages waiting to be indexed. Once full, the page fetch workers wait,
+# so a slow vector store holds back fetching instead of buffering the wiki.
+WIKI_PAGE_QUEUE_SIZE = WIKI_INDEX_BATCH_SIZE
+
 
 class TaskStatus(Enum):
     """Enum for task processing status."""
@@ -39,64 +53,6 @@ class TaskInfo:
     error: str | None
 
 
-@dataclass
-class Task:
-    """Represents a processing task."""
-
-    id: str
-    status: TaskInfo
-
-
-class TaskStore:
-    """Store for tracking task status and progress."""
-
-    def __init__(self):
-        self.tasks: Dict[str, Task] = {}
-        self._lock = asyncio.Lock()
-
-    async def create_task(self, task_id: str, total_pages: int) -> Task:
-        """Create a new task with initial status."""
-        async with self._lock:
-            task = Task(
-                id=task_id,
-                status=TaskInfo(
-                    status=TaskStatus.PENDING,
-                    total_pages=total_pages,
-                    processed_pages=[],
-                    remaining_pages=[],
-                    failed_pages=[],
-                    current_page=None,
-                    percent_complete=0.0,
-                    error=None,
-                ),
-            )
-            self.tasks[task_id] = task
-            return task
-
-    async def get_task(self, task_id: str) -> Optional[Task]:
-        """Get a task by its ID."""
-        async with self._lock:
-            return self.tasks.get(task_id)
-
-    async def update_task(self, task_id: str, status: TaskInfo) -> None:
-        """Update a task's status."""
-        async with self._lock:
-            if task_id in self.tasks:
-                self.tasks[task_id].status = status
-
-    async def get_task_by_wiki(
-        self, organization: str, project: str, wiki_identifier: str
-    ) -> Optional[str]:
-        """Get task ID by wiki details if it is already being processed."""
-        task_id = f"{organization}_{project}_{wiki_identifier}"
-        async with self._lock:
-            if task_id in self.tasks:
-                task = self.tasks[task_id]
-                if task.status.status in [TaskStatus.PENDING, TaskStatus.IN_PROGRESS]:
-                    return task_id
-            return None
-
-
 @dataclass
 class WikiPage:
     """Represents a single wiki page with its metadata and content."""
@@ -118,6 +74,56 @@ def _make_cache_key(params: Dict[str, Any], method: str = "GET") -> str:
     return f"{method}:{sorted_params}"
 
 
+# Lines that carry no indexable text on their own: headers, image-only and
+# link-only lines, URLs and table of contents markers
+_SKIP_LINE_RE = re.compile(
+    r"#|https?://|!?\[.*\)\Z|\(.*\)\Z|\[\[_TO(?:SP|C)_\]\]\Z", re.DOTALL
+)
+
+
+def _should_index(content: str) -> bool:
+    """
+    Check whether a wiki page has content worth indexing.
+
+    Pages with only headers, images, links, URLs, table of contents markers
+    or single characters are skipped. Scans the page once and stops at the
+    first line of real content.
+
+    Args:
+        content (str): Raw page content
+
+    Returns:
+        bool: True if the page contains at least one line of real content
+    """
+    for line in content.splitlines():
+        line = line.strip()
+
+        # Empty and single character lines (like ".") are skipped too
+        if len(line) > 1 and not _SKIP_LINE_RE.match(line):
+            return True
+
+    return False
+
+
+def wiki_task_id(organization: str, project: str, wiki_identifier: str) -> str:
+    """
+    Derive the deterministic task ID of a wiki.
+
+    The organization is lowercased to ensure consistency, the parts are
+    hashed so IDs cannot collide the way joined strings can.
+
+    Args:
+        organization (str): Organization name
+        project (str): Project name
+        wiki_identifier (str): Wiki identifier
+
+    Returns:
+        str: The task ID
+    """
+    key = f"{organization.lower()}|{project}|{wiki_identifier}"
+    return hashlib.blake2b(key.encode(), digest_size=12).hexdigest()
+
+
 def _prepare_params(params: Dict[str, Any]) -> Dict[str, str]:
     """
     Convert parameter values to strings suitable for URL query parameters.
@@ -140,10 +146,14 @@ def _prepare_params(params: Dict[str, Any]) -> Dict[str, str]:
 class WikiClient:
     """
     Concurrent-capable client for interacting with Azure DevOps Wiki REST API.
+
+    Requests go through the shared HTTP client, so connections to Azure
+    DevOps stay pooled across wiki tasks and with the website crawler.
     """
 
     def __init__(
         self,
+        http_client: httpx.AsyncClient,
         organization: str,
         project: str,
         wiki_identifier: str,
@@ -153,35 +163,19 @@ class WikiClient:
     ):
         """Initialize the Wiki Client with Azure DevOps credentials and connection settings."""
         self.base_url = f"https://dev.azure.com/{organization}/{project}/_apis/wiki/wikis/{wiki_identifier}/pages"
-        self.auth = aiohttp.BasicAuth("", personal_access_token)
+        self.http_client = http_client
+        self.auth = httpx.BasicAuth("", personal_access_token)
         self.api_version = "7.1"
+        self.max_concurrent_requests = max_concurrent_requests
         self.semaphore = Semaphore(max_concurrent_requests)
-        self.session = None
         self.connection_timeout = connection_timeout
         self.processing_pages: Set[str] = set()
         self.cache = cachetools.TTLCache(maxsize=100, ttl=3600)  # 1-hour cache
 
-    async def __aenter__(self):
-        """Initialize the aiohttp session when entering context."""
-        connector = TCPConnector(limit=50)  # Connection pool size
-        timeout = aiohttp.ClientTimeout(total=self.connection_timeout)
-        self.session = ClientSession(
-            connector=connector, timeout=timeout, auth=self.auth
-        )
-        return self
-
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Clean up the aiohttp session when exiting context."""
-        if self.session:
-            await self.session.close()
-
     async def _make_api_request(
         self, params: Dict[str, Any], method: str = "GET"
     ) -> Optional[Dict[str, Any]]:
         """Makes API requests with connection pooling and rate limiting."""
-        if not self.session:
-            raise WikiClientError("Client session not initialized")
-
         # Create cache key from original params
         cache_key = _make_cache_key(params, method)
 
@@ -194,24 +188,28 @@ class WikiClient:
 
         async with self.semaphore:  # Control concurrent requests
             try:
-                async with self.session.request(
-                    method, self.base_url, params=request_params
-                ) as response:
-                    if response.status == 429:  # Rate limit hit
-                        retry_after = int(response.headers.get("Retry-After", 5))
-                        logger.warning(f"Rate limit hit, waiting {retry_after} seconds")
-                        await asyncio.sleep(retry_after)
-                        return await self._make_api_request(params, method)
-
-                    response.raise_for_status()
-                    result = await response.json()
-
-                    # Cache the result
-                    self.cache[cache_key] = result
-                    return result
-
-            except aiohttp.ClientError as e:
-                logger.error(f"API Request failed: {str(e)}")
+                response = await self.http_client.request(
+                    method,
+                    self.base_url,
+                    params=request_params,
+                    auth=self.auth,
+                    timeout=self.connection_timeout,
+                )
+                if response.status_code == 429:  # Rate limit hit
+                    retry_after = int(response.headers.get("Retry-After", 5))
+                    logger.warning("Rate limit hit, waiting %s seconds", retry_after)
+                    await asyncio.sleep(retry_after)
+                    return await self._make_api_request(params, method)
+
+                response.raise_for_status()
+                result = response.json()
+
+                # Cache the result
+                self.cache[cache_key] = result
+                return result
+
+            except httpx.HTTPError as e:
+                logger.error("API Request failed: %s", e)
                 return None
 
     async def _get_page_content(self, page_path: str) -> str:
@@ -240,38 +238,110 @@ class WikiClient:
         params = {"path": "/", "recursionLevel": "full", "includeContent": True}
         return await self._make_api_request(params)
 
-    async def _flatten_pages(self, page: Dict[str, Any]) -> List[WikiPage]:
-        """Recursively flattens the wiki page tree with concurrent processing."""
-        pages = []
+    @staticmethod
+    def _walk(tree: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yields the pages of the tree in depth-first order."""
+        stack = [tree]
+        while stack:
+            page = stack.pop()
+            stack.extend(reversed(page.get("subPages", [])))
+            yield page
+
+    @classmethod
+    def _page_paths(cls, tree: Dict[str, Any]) -> List[str]:
+        """Lists the path of every page in the tree, parents before children."""
+        return [page.get("path", "/") for page in cls._walk(tree)]
+
+    async def _fetch_page(self, page: Dict[str, Any]) -> Optional[WikiPage]:
+        """Fetches the content of a page that came without it in the tree."""
         page_path = page.get("path", "/")
-        content = page.get("content")
-        remote_url = page.get("remoteUrl")
-
+        content = await self._get_page_content(page_path)
         if not content:
-            content = await self._get_page_content(page_path)
-
-        if content:
-            pages.append(
-                WikiPage(page_path=page_path, content=content, remote_url=remote_url)
-            )
-
-        # Process subpages concurrently
-        subpages = page.get("subPages", [])
-        tasks = [self._flatten_pages(subpage) for subpage in subpages]
-        results = await asyncio.gather(*tasks)
-
-        for result in results:
-            pages.extend(result)
+            return None
+        return WikiPage(
+            page_path=page_path, content=content, remote_url=page.get("remoteUrl")
+        )
 
-        return pages
+    async def _iter_pages(self, tree: Dict[str, Any]) -> AsyncIterator[WikiPage]:
+        """
+        Yields the pages of the tree as soon as their content is available.
+
+        A fixed set of workers takes pages off the tree walk, fetches the
+        content of those that came without it and queues them on a bounded
+        queue. While the consumer is busy indexing the queue fills up and the
+        workers stop fetching, so the pages held in memory stay bounded.
+        """
+        pages: asyncio.Queue = asyncio.Queue(maxsize=WIKI_PAGE_QUEUE_SIZE)
+        walk = self._walk(tree)
+
+        async def _fetch_pages() -> None:
+            # The walk is shared, each page goes to the first worker asking
+            for page in walk:
+                if content := page.get("content"):
+                    wiki_page = WikiPage(
+                        page_path=page.get("path", "/"),
+                        content=content,
+                        remote_url=page.get("remoteUrl"),
+                    )
+                else:
+                    wiki_page = await self._fetch_page(page)
+                if wiki_page:
+                    await pages.put(wiki_page)
+
+        async def _produce() -> None:
+            workers = [
+                asyncio.create_task(_fetch_pages())
+                for _ in range(self.max_concurrent_requests)
+            ]
+            try:
+                await asyncio.gather(*workers)
+            except Exception:
+                # Stop the other workers, the consumer re-raises the error
+                for worker in workers:
+                    worker.cancel()
+                await pages.put(None)
+                raise
+            # A None sentinel marks the end of the pages
+            await pages.put(None)
+
+        producer = asyncio.create_task(_produce())
+        try:
+            while (wiki_page := await pages.get()) is not None:
+                yield wiki_page
+            await producer
+        finally:
+            producer.cancel()
 
 
 class WikiService:
     """Service for processing wiki pages with task tracking."""
 
-    def __init__(self, indexer: IndexerService, database: DatabaseService):
+    def __init__(
+        self,
+        indexer: IndexerService,
+        database: DatabaseService,
+        http_client: httpx.AsyncClient,
+    ):
         self.indexer = indexer
         self.database = database
+        self.http_client = http_client
+
+    async def _mark_without_pages(self, task_id: str) -> None:
+        """Completes a task whose wiki has no pages to process."""
+        logger.info("No Pages found.")
+        await self.database.update_wiki_task(
+            task_id,
+            TaskInfo(
+                status=TaskStatus.COMPLETED,
+                total_pages=0,
+                processed_pages=[],
+                remaining_pages=[],
+                failed_pages=[],
+                current_page=None,
+                percent_complete=100.0,
+                error=None,
+            ),
+        )
 
     async def _process_wiki_pages(
         self,
@@ -281,30 +351,32 @@ class WikiService:
         wiki_identifier: str,
         max_concurrent_requests: int = 10,
     ) -> None:
-        """Internal method to process wiki pages and update task status."""
+        """
+        Internal method to process wiki pages and update task status.
+
+        Pages are indexed while they are fetched: every WIKI_INDEX_BATCH_SIZE
+        pages are handed to the vector store as soon as they are in, instead
+        of waiting for the whole wiki.
+        """
+        uploads: List[asyncio.Task] = []
         try:
-            pages = await fetch_wiki_pages(
+            access_token = os.getenv("WIKI_ACCESS_TOKEN")
+            if not access_token:
+                logger.error("WIKI_ACCESS_TOKEN environment variable not set")
+                await self._mark_without_pages(task_id)
+                return
+
+            client = WikiClient(
+                self.http_client,
                 organization,
                 project,
                 wiki_identifier,
+                access_token,
                 max_concurrent_requests,
             )
-
-            if not pages:
-                logger.info("No Pages found.")
-                self.database.update_wiki_task(
-                    task_id,
-                    TaskInfo(
-                        status=TaskStatus.COMPLETED,
-                        total_pages=0,
-                        processed_pages=[],
-                        remaining_pages=[],
-                        failed_pages=[],
-                        current_page=None,
-                        percent_complete=100.0,
-                        error=None,
-                    ),
-                )
+            wiki_tree = await client._get_wiki_tree()
+            if not wiki_tree:
+                await self._mark_without_pages(task_id)
                 return
 
             if not self.indexer.vector_store:
@@ -312,11 +384,11 @@ class WikiService:
                 raise Exception("Vector store not initialized")
 
             # Initialize status
-            total_pages = len(pages)
-            remaining_pages = [page.page_path for page in pages]
+            remaining_pages = client._page_paths(wiki_tree)
+            total_pages = len(remaining_pages)
 
             # Update initial status
-            self.database.update_wiki_task(
+            await self.database.update_wiki_task(
                 task_id,
                 TaskInfo(
                     status=TaskStatus.IN_PROGRESS,
@@ -324,137 +396,111 @@ class WikiService:
                     processed_pages=[],
                     remaining_pages=remaining_pages,
                     failed_pages=[],
-                    current_page=remaining_pages[0] if remaining_pages else None,
+                    current_page=remaining_pages[0],
                     percent_complete=0.0,
                     error=None,
                 ),
             )
 
-            # Process pages in chunks
-            chunk_size = 10
             processed_pages = []
             failed_pages = []
-
-            for i in range(0, len(pages), chunk_size):
-                chunk = pages[i : i + chunk_size]
-                docs = []
-
-                for page in chunk:
-                    logger.info(f"Processing page {page.page_path}")
-                    try:
-                        if not page.content.strip():
-                            logger.info(f"No content found. For page {page.page_path}")
-                            continue
-
-                        lines = [line.strip() for line in page.content.split("\n")]
-                        non_empty_lines = [line for line in lines if line]
-
-                        if not non_empty_lines:
-                            logger.info(f"Empty line. For page {page.page_path}")
-                            continue
-
-                        # Filter out pages with only headers, images, links, or minimal content
-                        def is_valid_content(lines: List[str]) -> bool:
-                            valid_content = False
-
-                            for line in lines:
-                                line = line.strip()
-                                if not line:
-                                    continue
-
-                                # Skip single character lines (like ".")
-                                if len(line) <= 1:
-                                    continue
-
-                                # Skip header-only lines
-                                if line.startswith("#"):
-                                    continue
-
-                                # Skip image-only lines
-                                if line.startswith("![") and line.endswith(")"):
-                                    continue
-
-                                # Skip link-only lines
-                                if (line.startswith("[") and line.endswith(")")) or (
-                                    line.startswith("(") and line.endswith(")")
-                                ):
-                                    continue
-
-                                # Skip URL-only lines
-                                if line.startswith("http://") or line.startswith(
-                                    "https://"
-                                ):
-                                    continue
-
-                                # Skip table of contents
-                                if line.strip() == "[[_TOSP_]]":
-                                    continue
-
-                                if line.strip() == "[[_TOC_]]":
-                                    continue
-
-                                valid_content = True
-
-                            return valid_content
-
-                        if not is_valid_content(non_empty_lines):
-                            logger.info(
-                                f"Skipping page {page.page_path} - Invalid content"
-                            )
-                            continue
-
-                        doc = Document(
-                            page_content=f"{page.page_path}\n{page.content}",
-                            metadata={
-                                "source": f"wiki_{page.page_path}",
-                                "organization": organization,
-                                "project": project,
-                            },
+            # Bounds the chunks being indexed, and so the pages held in memory
+            semaphore = Semaphore(max_concurrent_requests)
+            status_lock = asyncio.Lock()
+            # Progress is written at most once per interval, uploads can finish faster
+            progress_writes = Throttle()
+
+            async def _upload(chunk: List[Tuple[str, Document]]) -> int:
+                chunk_pages = [page_path for page_path, _ in chunk]
+                indexed = 0
+
+                try:
+                    logger.info("Adding %d into vector store.", len(chunk))
+                    await self.indexer.vector_store.aadd_documents(
+                        [doc for _, doc in chunk]
+                    )
+                    logger.info("Added %d chunks into vectorstore.", len(chunk))
+                    processed_pages.extend(chunk_pages)
+                    indexed = len(chunk)
+                except Exception as e:
+                    logger.error("Error indexing wiki pages: %s", e)
+                    failed_pages.extend(chunk_pages)
+                finally:
+                    semaphore.release()
+
+                if not progress_writes.ready():
+                    return indexed
+
+                # Serialize the writes so an older snapshot never lands last
+                async with status_lock:
+                    done = {*processed_pages, *failed_pages}
+                    remaining = [p for p in remaining_pages if p not in done]
+                    percent_complete = (
+                        (len(processed_pages) + len(failed_pages)) / total_pages * 100
+                    )
+
+                    await self.database.update_wiki_task(
+                        task_id,
+                        TaskInfo(
+                            status=TaskStatus.IN_PROGRESS,
+                            total_pages=total_pages,
+                            processed_pages=processed_pages,
+                            remaining_pages=remaining,
+                            failed_pages=failed_pages,
+                            current_page=remaining[0] if remaining else None,
+                            percent_complete=percent_complete,
+                            error=None,
+                        ),
+                    )
+
+                return indexed
+
+            async def _dispatch(chunk: List[Tuple[str, Document]]) -> None:
+                # Waits for a free slot, meanwhile the page queue fills up and
+                # the page fetches pause
+                await semaphore.acquire()
+                uploads.append(asyncio.create_task(_upload(chunk)))
+
+            # Build documents for pages with indexable content as they arrive
+            chunk: List[Tuple[str, Document]] = []
+            async for page in client._iter_pages(wiki_tree):
+                logger.debug("Processing page %s", page.page_path)
+                try:
+                    if not _should_index(page.content):
+                        logger.debug(
+                            "Skipping page %s - Invalid content", page.page_path
                         )
-                        # logger.info(f"Document for {page.page_path} \n\n {doc.page_content[:200]} \n\n")
-                        docs.append(doc)
-                        processed_pages.append(page.page_path)
-                    except Exception as e:
-                        logger.error(
-                            f"Error processing page {page.page_path}: {str(e)}"
-                        )
-                        failed_pages.append(page.page_path)
-
-                if docs:
-                    logger.info(f"Adding {len(docs)} into vector store.")
-                    # chunks = self.indexer.text_splitter.split_documents(docs)
-                    await self.indexer.vector_store.aadd_documents(docs)
-                    logger.info(f"Added {len(docs)} chunks into vectorstore.")
-
-                # Update task status
-                remaining_pages = [
-                    p
-                    for p in remaining_pages
-                    if p not in processed_pages and p not in failed_pages
-                ]
-                percent_complete = (
-                    (len(processed_pages) + len(failed_pages)) / total_pages * 100
-                )
-
-                self.database.update_wiki_task(
-                    task_id,
-                    TaskInfo(
-                        status=TaskStatus.IN_PROGRESS,
-                        total_pages=total_pages,
-                        processed_pages=processed_pages,
-                        remaining_pages=remaining_pages,
-                        failed_pages=failed_pages,
-                        current_page=remaining_pages[0] if remaining_pages else None,
-                        percent_complete=percent_complete,
-                        error=None,
-                    ),
-                )
+                        continue
+
+                    doc = Document(
+                        page_content=f"{page.page_path}\n{page.content}",
+                        metadata={
+                            "source": f"wiki_{page.page_path}",
+                            "organization": organization,
+                            "project": project,
+                        },
+                    )
+                    chunk.append((page.page_path, doc))
+                except Exception as e:
+                    logger.error("Error processing page %s: %s", page.page_path, e)
+                    failed_pages.append(page.page_path)
+
+                if len(chunk) == WIKI_INDEX_BATCH_SIZE:
+                    await _dispatch(chunk)
+                    chunk = []
+
+            if chunk:
+                await _dispatch(chunk)
+
+            results = await asyncio.gather(*uploads, return_exceptions=True)
+            total_docs = sum(r for r in results if isinstance(r, int))
+            logger.info("Indexed %d wiki pages for task %s", total_docs, task_id)
 
             # Update final status
             final_status = (
                 TaskStatus.COMPLETED if not failed_pages else TaskStatus.FAILED
             )
-            self.database.update_wiki_task(
+            await self.database.update_wiki_task(
                 task_id,
                 TaskInfo(
                     status=final_status,
@@ -471,8 +517,11 @@ class WikiService:
             )
 
         except Exception as e:
-            logger.error(f"Error processing wiki: {str(e)}")
-            self.database.update_wiki_task(
+            logger.error("Error processing wiki: %s", e)
+            # Stop pending uploads so they cannot overwrite the failed status
+            for upload in uploads:
+                upload.cancel()
+            await self.database.update_wiki_task(
                 task_id,
                 TaskInfo(
                     status=TaskStatus.FAILED,
@@ -486,23 +535,53 @@ class WikiService:
                 ),
             )
 
+    async def _process_wiki_task(
+        self,
+        task_id: str,
+        organization: str,
+        project: str,
+        wiki_identifier: str,
+        max_concurrent_requests: int,
+    ) -> None:
+        """Background task for wiki processing, admitted with the website crawls."""
+        # Tasks over the limit stay pending in the database until a slot frees up
+        try:
+            async with crawl_admission:
+                await self._process_wiki_pages(
+                    task_id,
+                    organization,
+                    project,
+                    wiki_identifier,
+                    max_concurrent_requests,
+                )
+        finally:
+            task_completions.finish(task_id)
+
     async def process_wiki(
         self,
         organization: str,
         project: str,
         wiki_identifier: str,
         max_concurrent_requests: int = 10,
-    ) -> str:
-        """Start wiki processing in the background and return task ID."""
-        # Make organization lowercase in task_id to ensure consistency
-        task_id = f"{organization.lower()}_{project}_{wiki_identifier}"
+    ) -> Optional[str]:
+        """
+        Start wiki processing in the background and return task ID.
+
+        Returns None, without starting anything, when the wiki already has a
+        task in the database.
+        """
+        task_id = wiki_task_id(organization, project, wiki_identifier)
 
         # Create task with initial status
-        self.database.create_wiki_task(task_id, organization, project, wiki_identifier)
+        if not await self.database.create_wiki_task(
+            task_id, organization, project, wiki_identifier
+        ):
+            return None
 
         # Start processing in background
-        asyncio.create_task(
-            self._process_wiki_pages(
+        task_completions.start(task_id)
+        task = asyncio.create_task(
+            self._process_wiki_task(
                 task_id,
                 organization,
                 project,
@@ -510,37 +589,7 @@ class WikiService:
                 max_concurrent_requests,
             )
         )
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
 
         return task_id
-
-
-async def fetch_wiki_pages(
-    organization: str,
-    project: str,
-    wiki_identifier: str,
-    max_concurrent_requests: int = 10,
-) -> Optional[List[WikiPage]]:
-    """Fetch all wiki pages concurrently with proper resource management."""
-    access_token = os.getenv("WIKI_ACCESS_TOKEN")
-    if not access_token:
-        logger.error("WIKI_ACCESS_TOKEN environment variable not set")
-        return None
-
-    try:
-        async with WikiClient(
-            organization,
-            project,
-            wiki_identifier,
-            access_token,
-            max_concurrent_requests,
-        ) as client:
-            wiki_tree = await client._get_wiki_tree()
-            if wiki_tree:
-                return await client._flatten_pages(wiki_tree)
-
-        return None
-
-    except Exception as e:
-        logger.error(f"Wiki page retrieval failed: {str(e)}")
-        logger.exception("Detailed error trace:")
-        return None
@@ -1,3 +1,4 @@
+import threading
 from typing import Optional
 
 from src.services.agent_service import AgentService
@@ -9,6 +10,7 @@ class AgentDependency:
     Implements the Singleton pattern to ensure only one instance exists.
     """
 
+    _lock = threading.Lock()
     _instance: Optional[AgentService] = None
 
     @classmethod
@@ -21,7 +23,9 @@ class AgentDependency:
         """
         try:
             if cls._instance is None:
-                cls._instance = AgentService()
+                with cls._lock:
+                    if cls._instance is None:
+                        cls._instance = AgentService()
             return cls._instance
         except Exception as e:
             raise Exception(f"Error initializing AgentService: {str(e)}")
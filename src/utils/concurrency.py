@@ -0,0 +1,144 @@
+import asyncio
+import os
+import time
+from typing import Any, Callable, Dict, TypeVar
+
+import anyio
+from anyio import to_thread
+
+T = TypeVar("T")
+
+# Maximum number of threads used for blocking SDK/IO calls made by services.
+# Kept separate from anyio's default limiter, which FastAPI uses for sync
+# dependencies and endpoints, so slow service calls cannot starve requests.
+MAX_SYNC_THREADS = 50
+
+# Maximum number of website and wiki crawls running at the same time in a
+# worker, each crawl fans out to its own max_concurrent_requests
+MAX_CONCURRENT_CRAWLS = int(os.getenv("MAX_CONCURRENT_CRAWLS", "4"))
+
+# Minimum seconds between two progress writes of a background job, the
+# final status is always written
+STATUS_WRITE_INTERVAL = 0.5
+
+sync_limiter = anyio.CapacityLimiter(MAX_SYNC_THREADS)
+
+
+async def run_sync(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run a blocking callable in a worker thread without blocking the event loop.
+
+    Args:
+        func (Callable[..., T]): The blocking callable
+        *args (Any): Positional arguments passed to the callable
+
+    Returns:
+        T: The callable's return value
+    """
+    return await to_thread.run_sync(func, *args, limiter=sync_limiter)
+
+
+class AdmissionController:
+    """
+    Process-wide cap on concurrently running background jobs.
+
+    Jobs over the limit wait in arrival order until a running one finishes.
+
+    Attributes:
+        limit (int): Maximum number of jobs admitted at the same time
+        active (int): Number of jobs currently admitted
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.active = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        """Wait until a slot is free and take it."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def release(self) -> None:
+        """Free a slot and wake one waiting job."""
+        async with self._condition:
+            self.active -= 1
+            self._condition.notify(1)
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.release()
+
+
+crawl_admission = AdmissionController(MAX_CONCURRENT_CRAWLS)
+
+
+class CompletionEvents:
+    """
+    Completion events of the background jobs running in this worker.
+
+    Lets status endpoints long-poll a job until it finishes instead of having
+    clients poll on a fixed interval. Only jobs started by this worker are
+    known, waiting on any other job returns immediately.
+    """
+
+    def __init__(self) -> None:
+        self._events: Dict[str, asyncio.Event] = {}
+
+    def start(self, job_id: str) -> None:
+        """Register a job that is about to run."""
+        self._events[job_id] = asyncio.Event()
+
+    def finish(self, job_id: str) -> None:
+        """Mark a job as finished and wake everyone waiting on it."""
+        if event := self._events.pop(job_id, None):
+            event.set()
+
+    async def wait(self, job_id: str, timeout: float) -> None:
+        """
+        Wait until the job finishes or the timeout expires.
+
+        Args:
+            job_id (str): The job to wait for
+            timeout (float): Maximum number of seconds to wait
+        """
+        if event := self._events.get(job_id):
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+
+task_completions = CompletionEvents()
+
+
+class Throttle:
+    """
+    Lets periodic work such as progress writes run at most once per interval.
+
+    Progress snapshots are cumulative, so a skipped write loses nothing: the
+    next one, or the final write, carries its changes.
+
+    Attributes:
+        interval (float): Minimum number of seconds between two runs
+    """
+
+    def __init__(self, interval: float = STATUS_WRITE_INTERVAL) -> None:
+        self.interval = interval
+        self._next_run = 0.0
+
+    def ready(self) -> bool:
+        """
+        Check whether the work may run now, starting a new interval if so.
+
+        Returns:
+            bool: True if the interval since the last run has passed
+        """
+        now = time.monotonic()
+        if now < self._next_run:
+            return False
+        self._next_run = now + self.interval
+        return True
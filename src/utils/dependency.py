@@ -1,18 +1,55 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional
 
+import httpx
+
 from src.services.database_service import DatabaseService
 from src.services.indexer_service import IndexerService
 
+# Start method of the process pool workers. They are started lazily, once the
+# logging, anyio and aiosqlite threads run, and forking a multithreaded process
+# can deadlock on locks held by those threads.
+PROCESS_POOL_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def _process_pool_size() -> int:
+    """
+    Number of pool workers per server worker.
+
+    Every uvicorn worker owns a pool, so the CPU cores are divided between
+    them instead of each one starting a worker per core. The server sets
+    WEB_CONCURRENCY to its worker count.
+
+    Returns:
+        int: The number of pool workers
+    """
+    server_workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    return max(1, (os.cpu_count() or 1) // server_workers)
+
 
 class Dependency:
     """
     Provider class that manages the lifecycle of service instances.
     Implements the Singleton pattern to ensure only one instance exists per service.
+
+    FastAPI resolves sync dependencies in a threadpool, so creation is guarded
+    by a lock to stop concurrent first requests from building a second
+    instance (and loading the embedding model twice).
     """
 
+    _lock = threading.Lock()
+
     # Class variable to store single instance
     _indexer_instance: Optional[IndexerService] = None
     _database_instance: Optional[DatabaseService] = None
+    _process_pool_instance: Optional[ProcessPoolExecutor] = None
+    _http_client_instance: Optional[httpx.AsyncClient] = None
+    _llm_http_client_instance: Optional[httpx.AsyncClient] = None
 
     @classmethod
     def get_indexer_instance(cls) -> IndexerService:
@@ -24,9 +61,12 @@ class Dependency:
         """
         try:
             if cls._indexer_instance is None:
-                cls._indexer_instance = IndexerService()
-                if not cls._indexer_instance.is_initialized:
-                    cls._indexer_instance.initialize()
+                with cls._lock:
+                    if cls._indexer_instance is None:
+                        indexer = IndexerService()
+                        if not indexer.is_initialized:
+                            indexer.initialize()
+                        cls._indexer_instance = indexer
             return cls._indexer_instance
         except Exception as e:
             raise Exception(f"Error initializing Indexer: {str(e)}")
@@ -41,12 +81,101 @@ class Dependency:
         """
         try:
             if cls._database_instance is None:
-                cls._database_instance = DatabaseService()
-                if not cls._database_instance.is_initialized:
-                    cls._database_instance.initialize()
+                with cls._lock:
+                    if cls._database_instance is None:
+                        database = DatabaseService()
+                        if not database.is_initialized:
+                            database.initialize()
+                        cls._database_instance = database
             return cls._database_instance
         except Exception as e:
-            raise Exception(f"Error initializing Indexer: {str(e)}")
+            raise Exception(f"Error initializing Database: {str(e)}")
+
+    @classmethod
+    async def close_database(cls) -> None:
+        """Close the Database connection pool if it has been created."""
+        if cls._database_instance is not None:
+            await cls._database_instance.close()
+
+    @classmethod
+    def get_process_pool_instance(cls) -> ProcessPoolExecutor:
+        """
+        Get or create the process pool used for CPU-bound work.
+
+        Returns:
+            ProcessPoolExecutor: The singleton process pool, sharing the CPU
+                cores with the pools of the other server workers
+        """
+        if cls._process_pool_instance is None:
+            with cls._lock:
+                if cls._process_pool_instance is None:
+                    cls._process_pool_instance = ProcessPoolExecutor(
+                        max_workers=_process_pool_size(),
+                        mp_context=multiprocessing.get_context(
+                            PROCESS_POOL_START_METHOD
+                        ),
+                    )
+        return cls._process_pool_instance
+
+    @classmethod
+    def shutdown_process_pool(cls) -> None:
+        """Shut down the process pool if it has been created."""
+        if cls._process_pool_instance is not None:
+            cls._process_pool_instance.shutdown(wait=False, cancel_futures=True)
+            cls._process_pool_instance = None
+
+    @classmethod
+    def get_http_client_instance(cls) -> httpx.AsyncClient:
+        """
+        Get or create the shared outbound HTTP client.
+
+        A single client keeps TCP/TLS connections alive across requests
+        instead of paying a new handshake for every outbound call.
+
+        Returns:
+            httpx.AsyncClient: The singleton HTTP client
+        """
+        if cls._http_client_instance is None:
+            cls._http_client_instance = httpx.AsyncClient(
+                timeout=30,
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+                follow_redirects=True,
+            )
+        return cls._http_client_instance
+
+    @classmethod
+    async def close_http_client(cls) -> None:
+        """Close the shared HTTP client if it has been created."""
+        if cls._http_client_instance is not None:
+            await cls._http_client_instance.aclose()
+            cls._http_client_instance = None
+
+    @classmethod
+    def get_llm_http_client_instance(cls) -> httpx.AsyncClient:
+        """
+        Get or create the HTTP/2 client used for LLM API calls.
+
+        Every completion goes to the same host, so HTTP/2 multiplexes the
+        concurrent calls over a few warm connections instead of opening one
+        TLS connection per in-flight request.
+
+        Returns:
+            httpx.AsyncClient: The singleton LLM HTTP client
+        """
+        if cls._llm_http_client_instance is None:
+            cls._llm_http_client_instance = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(60, connect=10),
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+            )
+        return cls._llm_http_client_instance
+
+    @classmethod
+    async def close_llm_http_client(cls) -> None:
+        """Close the LLM HTTP client if it has been created."""
+        if cls._llm_http_client_instance is not None:
+            await cls._llm_http_client_instance.aclose()
+            cls._llm_http_client_instance = None
 
 
 def get_indexer():
@@ -62,3 +191,53 @@ def get_indexer():
 def get_database():
     """"""
     return Dependency.get_database_instance()
+
+
+async def close_database():
+    """Close the Database connection pool on application shutdown."""
+    await Dependency.close_database()
+
+
+def get_process_pool():
+    """
+    Provider function for the shared CPU-bound process pool.
+
+    Returns:
+        ProcessPoolExecutor: The singleton process pool
+    """
+    return Dependency.get_process_pool_instance()
+
+
+def shutdown_process_pool():
+    """Shut down the shared process pool on application shutdown."""
+    Dependency.shutdown_process_pool()
+
+
+def get_http_client():
+    """
+    Dependency provider function for the shared outbound HTTP client.
+
+    Returns:
+        httpx.AsyncClient: The singleton HTTP client
+    """
+    return Dependency.get_http_client_instance()
+
+
+async def close_http_client():
+    """Close the shared HTTP client on application shutdown."""
+    await Dependency.close_http_client()
+
+
+def get_llm_http_client():
+    """
+    Provider function for the shared HTTP/2 client used for LLM API calls.
+
+    Returns:
+        httpx.AsyncClient: The singleton LLM HTTP client
+    """
+    return Dependency.get_llm_http_client_instance()
+
+
+async def close_llm_http_client():
+    """Close the LLM HTTP client on application shutdown."""
+    await Dependency.close_llm_http_client()
@@ -0,0 +1,42 @@
+import threading
+from typing import Optional
+
+from src.services.document_service import DocumentService
+
+
+class DocumentDependency:
+    """
+    Provider class that manages the DocumentService lifecycle.
+    Implements the Singleton pattern to ensure only one instance exists, so
+    its semaphore bounds the documents processed across all requests.
+    """
+
+    _lock = threading.Lock()
+    _instance: Optional[DocumentService] = None
+
+    @classmethod
+    def get_instance(cls) -> DocumentService:
+        """
+        Get or create the DocumentService instance.
+
+        Returns:
+            DocumentService: The singleton instance of the DocumentService
+        """
+        try:
+            if cls._instance is None:
+                with cls._lock:
+                    if cls._instance is None:
+                        cls._instance = DocumentService()
+            return cls._instance
+        except Exception as e:
+            raise Exception(f"Error initializing DocumentService: {str(e)}")
+
+
+def get_document_service():
+    """
+    Dependency provider function for FastAPI.
+
+    Returns:
+        DocumentService: The singleton DocumentService instance
+    """
+    return DocumentDependency.get_instance()
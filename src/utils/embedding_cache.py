@@ -0,0 +1,148 @@
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.utils.concurrency import run_sync
+
+# Keys looked up per query, below SQLite's limit on bound parameters
+LOOKUP_BATCH_SIZE = 500
+
+
+class EmbeddingCache:
+    """
+    On-disk store of document embeddings keyed by model and content hash.
+
+    Vectors are stored as float32 blobs in a small SQLite database, shared by
+    the threads the vector store embeds from, so unchanged content is never
+    sent to the embedding model again, across re-indexing and restarts.
+
+    Attributes:
+        model (str): Name of the model the cached embeddings come from
+    """
+
+    def __init__(self, path: Path, model: str) -> None:
+        self.model = model
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS embeddings(
+                    model TEXT,
+                    hash TEXT,
+                    vec BLOB,
+                    PRIMARY KEY (model, hash)
+                )
+            """)
+
+    @staticmethod
+    def key(text: str) -> str:
+        """
+        Hash a text into its cache key.
+
+        Args:
+            text (str): The embedded text
+
+        Returns:
+            str: The 128-bit BLAKE2b hex digest of the text
+        """
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """
+        Look up the cached embeddings of several keys.
+
+        Args:
+            keys (Sequence[str]): Cache keys of the texts
+
+        Returns:
+            Dict[str, List[float]]: Embeddings of the keys found in the cache
+        """
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), LOOKUP_BATCH_SIZE):
+                batch = keys[i : i + LOOKUP_BATCH_SIZE]
+                placeholders = ", ".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT hash, vec FROM embeddings "
+                    f"WHERE model = ? AND hash IN ({placeholders})",
+                    (self.model, *batch),
+                )
+                for key, vec in rows:
+                    found[key] = np.frombuffer(vec, dtype=np.float32).tolist()
+        return found
+
+    def put_many(self, embeddings: Dict[str, List[float]]) -> None:
+        """
+        Store embeddings in a single transaction.
+
+        Args:
+            embeddings (Dict[str, List[float]]): Embeddings keyed by cache key
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, hash, vec) VALUES (?, ?, ?)",
+                [
+                    (self.model, key, np.asarray(vec, dtype=np.float32).tobytes())
+                    for key, vec in embeddings.items()
+                ],
+            )
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper answering document embeddings from an EmbeddingCache.
+
+    Only texts missing from the cache, each once, are sent to the wrapped
+    model, and their embeddings are stored for the next time. Queries are
+    passed through uncached.
+
+    Attributes:
+        embeddings (Embeddings): The wrapped embedding model
+        cache (EmbeddingCache): Store of previously computed embeddings
+    """
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache) -> None:
+        self.embeddings = embeddings
+        self.cache = cache
+
+    def _missing(
+        self, keys: List[str], texts: List[str], cached: Dict[str, List[float]]
+    ) -> Dict[str, str]:
+        return {key: text for key, text in zip(keys, texts) if key not in cached}
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed search docs, computing only the uncached ones."""
+        keys = [self.cache.key(text) for text in texts]
+        cached = self.cache.get_many(keys)
+        if missing := self._missing(keys, texts, cached):
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            computed = dict(zip(missing, vectors))
+            self.cache.put_many(computed)
+            cached.update(computed)
+        return [cached[key] for key in keys]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed search docs, computing only the uncached ones."""
+        keys = [self.cache.key(text) for text in texts]
+        cached = await run_sync(self.cache.get_many, keys)
+        if missing := self._missing(keys, texts, cached):
+            vectors = await self.embeddings.aembed_documents(list(missing.values()))
+            computed = dict(zip(missing, vectors))
+            await run_sync(self.cache.put_many, computed)
+            cached.update(computed)
+        return [cached[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed query text."""
+        return self.embeddings.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Embed query text."""
+        return await self.embeddings.aembed_query(text)
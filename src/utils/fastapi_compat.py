@@ -0,0 +1,63 @@
+import functools
+import weakref
+from typing import Any, Callable
+
+from fastapi.dependencies import utils as dependency_utils
+from fastapi.dependencies.models import Dependant
+
+# Inspection helpers that FastAPI calls for every dependency on every request
+_INSPECTION_HELPERS = (
+    "is_coroutine_callable",
+    "is_gen_callable",
+    "is_async_gen_callable",
+)
+
+
+def _cache_by_callable(
+    func: Callable[[Callable[..., Any]], bool],
+) -> Callable[[Callable[..., Any]], bool]:
+    """
+    Memoize a callable inspection helper keyed by the inspected callable.
+
+    Results are held in a WeakKeyDictionary so endpoints and dependencies can
+    still be garbage collected. Callables that cannot be weakly referenced are
+    inspected on every call, as before.
+
+    Args:
+        func (Callable): The FastAPI inspection helper to wrap
+
+    Returns:
+        Callable: The memoized helper
+    """
+    cache: "weakref.WeakKeyDictionary[Callable[..., Any], bool]" = (
+        weakref.WeakKeyDictionary()
+    )
+
+    @functools.wraps(func)
+    def wrapper(call: Callable[..., Any]) -> bool:
+        try:
+            return cache[call]
+        except KeyError:
+            result = cache[call] = func(call)
+            return result
+        except TypeError:
+            return func(call)
+
+    return wrapper
+
+
+def install_dependency_inspection_cache() -> None:
+    """
+    Backport FastAPI's per-dependency inspection cache to older releases.
+
+    Before 0.121 FastAPI re-runs inspect.iscoroutinefunction and friends for
+    every dependency of every request. Newer releases cache the results on
+    the Dependant, in which case this is a no-op. Safe to call repeatedly.
+    """
+    if hasattr(Dependant, "is_coroutine_callable"):
+        return
+
+    for name in _INSPECTION_HELPERS:
+        helper = getattr(dependency_utils, name)
+        if not hasattr(helper, "__wrapped__"):
+            setattr(dependency_utils, name, _cache_by_callable(helper))
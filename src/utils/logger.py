@@ -1,10 +1,12 @@
 import asyncio
+import atexit
 import datetime
 import functools
 import logging
+import queue
 import sys
 import time
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Any, Callable
 
@@ -37,6 +39,10 @@ def setup_logger(
     """
     Setup logger with both file and console handlers
 
+    Records are put on an in-memory queue and written to the file and the
+    console by a background listener thread, so callers on the event loop
+    never block on log I/O.
+
     Args:
         name (str): Logger name (typically __name__)
         log_level (str): Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
@@ -80,8 +86,12 @@ def setup_logger(
 
     # Add handlers to logger if they haven't been added
     if not logger.handlers:
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        log_queue: queue.Queue = queue.Queue(-1)
+        listener = QueueListener(log_queue, file_handler, console_handler)
+        listener.start()
+        # Flush pending records on interpreter shutdown
+        atexit.register(listener.stop)
+        logger.addHandler(QueueHandler(log_queue))
 
     return logger
 
@@ -103,7 +113,7 @@ def log_time(func: Callable) -> Callable:
             )
             return result
         except Exception as e:
-            logger.error(f"{func.__name__} failed: {str(e)}")
+            logger.error("%s failed: %s", func.__name__, e)
             raise
 
     @functools.wraps(func)
@@ -116,7 +126,7 @@ def log_time(func: Callable) -> Callable:
             )
             return result
         except Exception as e:
-            logger.error(f"{func.__name__} failed: {str(e)}")
+            logger.error("%s failed: %s", func.__name__, e)
             raise
 
     # Return appropriate wrapper based on whether the function is async or not
@@ -0,0 +1,115 @@
+import time
+from typing import Sequence
+
+import orjson
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.logger import logger
+
+# Response sent for unhandled exceptions, serialized once at import
+INTERNAL_ERROR_BODY = orjson.dumps({"detail": "Internal server error"})
+INTERNAL_ERROR_HEADERS = [
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(INTERNAL_ERROR_BODY)).encode()),
+]
+
+
+class StreamingAwareGZipMiddleware:
+    """
+    GZip middleware that leaves streaming endpoints untouched.
+
+    Compressing a Server-Sent Events stream makes the compressor buffer the
+    tokens instead of flushing them to the client, so requests whose path
+    starts with one of the excluded prefixes skip compression entirely.
+
+    Attributes:
+        app (ASGIApp): The wrapped application, used for excluded paths
+        gzip_app (GZipMiddleware): The wrapped application with compression
+        excluded_paths (tuple[str, ...]): Path prefixes that are never compressed
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1000,
+        compresslevel: int = 5,
+        excluded_paths: Sequence[str] = (),
+    ) -> None:
+        self.app = app
+        self.gzip_app = GZipMiddleware(
+            app, minimum_size=minimum_size, compresslevel=compresslevel
+        )
+        self.excluded_paths = tuple(excluded_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and not scope["path"].startswith(
+            self.excluded_paths
+        ):
+            await self.gzip_app(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
+class RequestEnvelopeMiddleware:
+    """
+    Pure ASGI middleware wrapping every request in a common envelope.
+
+    Emits a single log line per request with the method, path, status code
+    and duration, replacing uvicorn's access log, and translates unhandled
+    exceptions into a pre-serialized JSON 500 response so route handlers do
+    not need their own try/except blocks. Unlike BaseHTTPMiddleware it does
+    not wrap the response in a background task.
+
+    Attributes:
+        app (ASGIApp): The wrapped application
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter_ns()
+        status_code = 500
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_started
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            logger.exception(
+                "%s %s 500 %.2fms",
+                scope["method"],
+                scope["path"],
+                (time.perf_counter_ns() - start) / 1e6,
+            )
+            # Nothing can be sent once a (streaming) response has started
+            if response_started:
+                raise
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 500,
+                    "headers": INTERNAL_ERROR_HEADERS,
+                }
+            )
+            await send({"type": "http.response.body", "body": INTERNAL_ERROR_BODY})
+            return
+
+        logger.info(
+            "%s %s %d %.2fms",
+            scope["method"],
+            scope["path"],
+            status_code,
+            (time.perf_counter_ns() - start) / 1e6,
+        )
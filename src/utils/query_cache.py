@@ -0,0 +1,126 @@
+import time
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+# Cosine similarity above which two queries are answered with the same documents
+DEFAULT_SIMILARITY_THRESHOLD = 0.97
+
+
+def unit_vector(embedding: Sequence[float]) -> np.ndarray:
+    """
+    Scale an embedding to unit length, so a dot product is the cosine similarity.
+
+    Args:
+        embedding (Sequence[float]): The embedding to normalize
+
+    Returns:
+        np.ndarray: The normalized embedding
+    """
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class SemanticQueryCache:
+    """
+    Cache of retrieved documents matching repeated and near-identical queries.
+
+    Exact repeats are found by their normalized text, without computing an
+    embedding. Other queries are compared by the cosine similarity of their
+    embedding with every cached one, a single matrix product, and reuse the
+    documents of the closest query above the threshold. Entries expire after
+    ttl seconds so newly indexed documents are picked up.
+
+    Attributes:
+        max_size (int): Maximum number of cached queries
+        ttl (float): Seconds an entry stays valid
+        threshold (float): Minimum cosine similarity for a semantic hit
+    """
+
+    def __init__(
+        self,
+        max_size: int = 512,
+        ttl: float = 300.0,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.threshold = threshold
+        # Insertion ordered, so the oldest entries are always at the front
+        self._entries: "OrderedDict[str, Tuple[float, np.ndarray, List[Document]]]" = (
+            OrderedDict()
+        )
+        self._matrix: Optional[np.ndarray] = None
+        self._matrix_keys: List[str] = []
+
+    @staticmethod
+    def _normalize(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def _expire(self) -> None:
+        """Drop the entries older than the TTL."""
+        deadline = time.monotonic() - self.ttl
+        while self._entries:
+            key, (created_at, _, _) = next(iter(self._entries.items()))
+            if created_at > deadline:
+                break
+            del self._entries[key]
+            self._matrix = None
+
+    def get(self, query: str) -> Optional[List[Document]]:
+        """
+        Look up the documents cached for the exact same query.
+
+        Args:
+            query (str): The user query
+
+        Returns:
+            Optional[List[Document]]: The cached documents, if any
+        """
+        self._expire()
+        entry = self._entries.get(self._normalize(query))
+        return entry[2] if entry else None
+
+    def get_similar(self, embedding: Sequence[float]) -> Optional[List[Document]]:
+        """
+        Look up the documents cached for the most similar query.
+
+        Args:
+            embedding (Sequence[float]): Embedding of the user query
+
+        Returns:
+            Optional[List[Document]]: The cached documents, if a query is
+                similar enough
+        """
+        self._expire()
+        if not self._entries:
+            return None
+
+        if self._matrix is None:
+            self._matrix_keys = list(self._entries)
+            self._matrix = np.stack([self._entries[k][1] for k in self._matrix_keys])
+
+        similarities = self._matrix @ unit_vector(embedding)
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        return self._entries[self._matrix_keys[best]][2]
+
+    def put(self, query: str, embedding: Sequence[float], docs: List[Document]) -> None:
+        """
+        Cache the documents retrieved for a query.
+
+        Args:
+            query (str): The user query
+            embedding (Sequence[float]): Embedding of the user query
+            docs (List[Document]): The retrieved documents
+        """
+        key = self._normalize(query)
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic(), unit_vector(embedding), docs)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        self._matrix = None
@@ -0,0 +1,91 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+
+import aiosqlite
+
+# Upper bound on open connections, SQLite serializes writers anyway
+DEFAULT_POOL_SIZE = 5
+
+
+class SQLiteConnectionPool:
+    """
+    Small pool of reusable aiosqlite connections.
+
+    Connections are opened lazily by the factory, up to max_size, and handed
+    back to the pool after use, so requests reuse a warm connection (and its
+    page cache) instead of opening the database file every time.
+
+    Writes go through one dedicated connection instead, used by one block at
+    a time. SQLite only allows a single writer, so this queues writers of the
+    process on a lock rather than having them collide on the database lock
+    and back off through busy_timeout. aiosqlite already runs each connection
+    on its own thread, draining a request queue.
+
+    Attributes:
+        max_size (int): Maximum number of open connections
+    """
+
+    def __init__(
+        self,
+        connection_factory: Callable[[], Awaitable[aiosqlite.Connection]],
+        max_size: int = DEFAULT_POOL_SIZE,
+    ) -> None:
+        self.max_size = max_size
+        self._connection_factory = connection_factory
+        self._semaphore = asyncio.Semaphore(max_size)
+        self._idle: List[aiosqlite.Connection] = []
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._writer_lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Borrow a connection from the pool, opening one if none is idle.
+
+        An open transaction is rolled back if the block raises, so the
+        connection goes back to the pool in a clean state.
+
+        Yields:
+            aiosqlite.Connection: The borrowed connection
+        """
+        async with self._semaphore:
+            conn = self._idle.pop() if self._idle else await self._connection_factory()
+            try:
+                yield conn
+            except BaseException:
+                if conn.in_transaction:
+                    await conn.rollback()
+                raise
+            finally:
+                self._idle.append(conn)
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Borrow the writer connection, waiting for other writers to finish.
+
+        An open transaction is rolled back if the block raises.
+
+        Yields:
+            aiosqlite.Connection: The writer connection
+        """
+        async with self._writer_lock:
+            if self._writer is None:
+                self._writer = await self._connection_factory()
+            conn = self._writer
+            try:
+                yield conn
+            except BaseException:
+                if conn.in_transaction:
+                    await conn.rollback()
+                raise
+
+    async def close(self) -> None:
+        """Close the writer and every idle connection."""
+        idle, self._idle = self._idle, []
+        if self._writer is not None:
+            idle.append(self._writer)
+            self._writer = None
+        for conn in idle:
+            await conn.close()
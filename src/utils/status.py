@@ -0,0 +1,181 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Type
+
+import cachetools
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+from src.services.database_service import DatabaseService
+from src.utils.concurrency import task_completions
+from src.utils.dependency import get_database
+
+# Upper bound on task IDs accepted by the batch status endpoint
+MAX_STATUS_BATCH_SIZE = 200
+
+# Longest a status request may wait for its task to finish, in seconds
+MAX_STATUS_WAIT = 25
+
+# Serialized status responses of recently polled tasks, per kind of task
+STATUS_CACHE_SIZE = 1024
+
+TaskGetter = Callable[[DatabaseService, str], Awaitable[Optional[Dict[str, Any]]]]
+TasksGetter = Callable[
+    [DatabaseService, List[str]], Awaitable[Dict[str, Dict[str, Any]]]
+]
+
+
+class TaskStatusRoutes:
+    """
+    Status endpoints of a kind of background task, website or wiki.
+
+    Task records returned by the database keep their progress under the
+    "status" key, with the same field names as the response model, so one
+    implementation serves every router that registers it.
+
+    Attributes:
+        response_model (Type[BaseModel]): Model of a task's status response
+        get_task (TaskGetter): DatabaseService method fetching one task
+        get_tasks (TasksGetter): DatabaseService method fetching several tasks
+    """
+
+    def __init__(
+        self,
+        response_model: Type[BaseModel],
+        get_task: TaskGetter,
+        get_tasks: TasksGetter,
+    ) -> None:
+        self.response_model = response_model
+        self.get_task = get_task
+        self.get_tasks = get_tasks
+        self._body_cache = cachetools.LRUCache(maxsize=STATUS_CACHE_SIZE)
+
+    def to_status_response(self, task: Dict[str, Any]) -> BaseModel:
+        """
+        Build the status response for a task returned by the database.
+
+        Args:
+            task (Dict[str, Any]): The task record
+
+        Returns:
+            BaseModel: The task's processing status
+        """
+        progress = task["status"]
+        return self.response_model(
+            **{
+                field: progress[field]
+                for field in self.response_model.model_fields
+                if field != "status"
+            },
+            status=progress["status"].value,
+        )
+
+    def status_body(self, task: Dict[str, Any]) -> bytes:
+        """
+        Serialize the status response of a task, reusing the last serialization.
+
+        Every status write bumps the task's updated_at, so a cached body is only
+        reused while the task has not changed since it was built.
+
+        Args:
+            task (Dict[str, Any]): The task record
+
+        Returns:
+            bytes: The JSON encoded status response
+        """
+        cached = self._body_cache.get(task["task_id"])
+        if cached and cached[0] == task["updated_at"]:
+            return cached[1]
+
+        body = orjson.dumps(self.to_status_response(task).model_dump())
+        self._body_cache[task["task_id"]] = (task["updated_at"], body)
+        return body
+
+    def register(self, router: APIRouter) -> None:
+        """
+        Add the batch and single task status endpoints to a router.
+
+        Args:
+            router (APIRouter): The router of the kind of task
+        """
+
+        @router.get(
+            "/status",
+            response_model=Dict[str, Optional[self.response_model]],
+            response_class=ORJSONResponse,
+        )
+        async def get_processing_statuses(
+            task_ids: List[str] = Query(
+                ..., min_length=1, max_length=MAX_STATUS_BATCH_SIZE
+            ),
+            database: DatabaseService = Depends(get_database),
+        ) -> Response:
+            """
+            Get the processing status of several tasks in a single request.
+
+            Tasks are looked up with one database query and returned keyed by
+            task ID in request order, unknown IDs map to null.
+            """
+            tasks = await self.get_tasks(database, task_ids)
+
+            # Stitch the cached per-task bodies together instead of validating
+            # and encoding every status again
+            entries = (
+                orjson.dumps(task_id)
+                + b":"
+                + (self.status_body(tasks[task_id]) if task_id in tasks else b"null")
+                for task_id in dict.fromkeys(task_ids)
+            )
+            return Response(
+                content=b"{" + b",".join(entries) + b"}",
+                media_type="application/json",
+            )
+
+        @router.get(
+            "/status/{task_id}",
+            response_model=self.response_model,
+            response_class=ORJSONResponse,
+            description=(
+                "Get detailed processing status for frontend tracking. With "
+                "`wait` set the request long-polls: it returns as soon as the "
+                "task finishes, or with the current progress once the wait "
+                "expires. Only the server worker process running a task is "
+                "notified when it finishes. When the service runs several "
+                "workers, a request served by another worker does not wait "
+                "and returns the current progress right away, so clients "
+                "should keep polling until the task is completed or failed."
+            ),
+        )
+        async def get_processing_status(
+            task_id: str,
+            wait: float = Query(
+                0,
+                ge=0,
+                le=MAX_STATUS_WAIT,
+                description=(
+                    "Seconds to wait for a running task to finish, only honored "
+                    "by the worker process running the task"
+                ),
+            ),
+            database: DatabaseService = Depends(get_database),
+        ) -> Response:
+            """
+            Get detailed processing status for frontend tracking.
+
+            With wait set the request long-polls: it returns as soon as the
+            task finishes, or with the current progress once the wait expires.
+            Completion events are per process, on another worker than the one
+            running the task the request returns immediately.
+            """
+            if wait:
+                await task_completions.wait(task_id, wait)
+
+            task = await self.get_task(database, task_id)
+            if not task:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+                )
+
+            return Response(
+                content=self.status_body(task), media_type="application/json"
+            )
@@ -0,0 +1,70 @@
+import asyncio
+import unittest
+from typing import AsyncGenerator, List, Tuple
+from unittest import mock
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.routes import agent
+
+
+def parse_event_stream(body: str) -> Tuple[List[str], List[str]]:
+    """Split an event stream into its event data and its comments, like a client."""
+    events, comments, data = [], [], []
+    for line in body.splitlines():
+        if not line:
+            if data:
+                events.append("\n".join(data))
+                data = []
+        elif line.startswith(":"):
+            comments.append(line[1:].strip())
+        elif line.startswith("data:"):
+            value = line[len("data:") :]
+            data.append(value[1:] if value.startswith(" ") else value)
+    return events, comments
+
+
+class WithHeartbeatTest(unittest.TestCase):
+    def stream(self, *chunks: bytes) -> str:
+        """Serve a generator that stalls before each chunk and read the body."""
+
+        async def stalled() -> AsyncGenerator[bytes, None]:
+            for chunk in chunks:
+                await asyncio.sleep(0.3)
+                yield chunk
+
+        app = FastAPI()
+
+        @app.get("/")
+        async def endpoint(request: Request) -> StreamingResponse:
+            return StreamingResponse(
+                agent.with_heartbeat(request, stalled()),
+                media_type="text/event-stream",
+            )
+
+        with mock.patch.object(agent, "HEARTBEAT_INTERVAL", 0.1):
+            with TestClient(app) as client:
+                return client.get("/").text
+
+    def test_heartbeats_are_comments_outside_the_answer(self) -> None:
+        events, comments = parse_event_stream(
+            self.stream(b"Paris is ", b"the capital.")
+        )
+
+        self.assertEqual("".join(events), "Paris is the capital.")
+        self.assertTrue(comments)
+        self.assertEqual(set(comments), {"heartbeat"})
+
+    def test_line_breaks_in_the_answer_survive_framing(self) -> None:
+        answer = ["# Steps\n\n1. Open", " the wiki\r\n2. Search\n"]
+        events, _ = parse_event_stream(
+            self.stream(*(chunk.encode() for chunk in answer))
+        )
+
+        self.assertEqual("".join(events), "# Steps\n\n1. Open the wiki\n2. Search\n")
+
+
+if __name__ == "__main__":
+    unittest.main()